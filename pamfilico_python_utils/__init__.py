@@ -1,16 +1,36 @@
 """Pamfilico Python utility functions and helpers."""
 
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 __version__ = "0.1.0"
 
-from pamfilico_python_utils.sqlalchemy import (
-    DateTimeMixin,
-    NextAuthAccountMixin,
-    NextAuthSessionMixin,
-    NextAuthUserMixin,
-    NextAuthVerificationTokenMixin,
-    generate_uuid,
-)
-from pamfilico_python_utils.storage import DigitalOceanSpacesClient
+if TYPE_CHECKING:
+    from pamfilico_python_utils.sqlalchemy import (
+        DateTimeMixin,
+        NextAuthAccountMixin,
+        NextAuthSessionMixin,
+        NextAuthUserMixin,
+        NextAuthVerificationTokenMixin,
+        ServerDateTimeMixin,
+        generate_uuid,
+        make_engine,
+    )
+    from pamfilico_python_utils.storage import DigitalOceanSpacesClient
+
+# Top-level exports and the subpackage each comes from. They are imported on
+# first access, so the CLI tools start without loading SQLAlchemy and boto3.
+_EXPORTS = {
+    "DateTimeMixin": "pamfilico_python_utils.sqlalchemy",
+    "NextAuthAccountMixin": "pamfilico_python_utils.sqlalchemy",
+    "NextAuthSessionMixin": "pamfilico_python_utils.sqlalchemy",
+    "NextAuthUserMixin": "pamfilico_python_utils.sqlalchemy",
+    "NextAuthVerificationTokenMixin": "pamfilico_python_utils.sqlalchemy",
+    "ServerDateTimeMixin": "pamfilico_python_utils.sqlalchemy",
+    "generate_uuid": "pamfilico_python_utils.sqlalchemy",
+    "make_engine": "pamfilico_python_utils.sqlalchemy",
+    "DigitalOceanSpacesClient": "pamfilico_python_utils.storage",
+}
 
 __all__ = [
     "DateTimeMixin",
@@ -18,6 +38,21 @@ __all__ = [
     "NextAuthSessionMixin",
     "NextAuthUserMixin",
     "NextAuthVerificationTokenMixin",
+    "ServerDateTimeMixin",
     "generate_uuid",
+    "make_engine",
     "DigitalOceanSpacesClient",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
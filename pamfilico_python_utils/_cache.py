@@ -0,0 +1,86 @@
+"""
+Small in-process caches shared by the flask and storage helpers.
+
+Components
+----------
+TTLCache
+    Thread-safe mapping whose entries expire a fixed time after being set
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe cache whose entries expire ``ttl`` seconds after being set.
+
+    Expired entries are dropped when they are looked up. When the cache is
+    full, the oldest entry is evicted; expired entries are also purged, but
+    at most once per ``ttl`` so that a full cache stays O(1) per insert.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries kept
+    ttl : float
+        Seconds an entry stays valid
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._next_purge = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value stored under key, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            with self._lock:
+                self._data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key for the next ``ttl`` seconds, or the cache's ttl."""
+        now = time.monotonic()
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            elif len(self._data) >= self.maxsize:
+                if now >= self._next_purge:
+                    self._purge_expired(now)
+                while len(self._data) >= self.maxsize:
+                    self._data.popitem(last=False)
+            self._data[key] = (now + (self.ttl if ttl is None else ttl), value)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove the entry stored under key, if any."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def discard(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """Remove the entries for which predicate(key, value) is true."""
+        with self._lock:
+            self._data = OrderedDict(
+                (k, e) for k, e in self._data.items() if not predicate(k, e[1])
+            )
+
+    def _purge_expired(self, now: float) -> None:
+        """Drop expired entries; called with the lock held."""
+        self._data = OrderedDict((k, e) for k, e in self._data.items() if e[0] >= now)
+        self._next_purge = now + self.ttl
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,104 @@
+"""Shared pyproject.toml lookup for the CLI entry points
+
+Each tool reads its settings from a ``[tool.<name>]`` table in the nearest
+pyproject.toml, optionally falling back to another tool's table.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+def _import_toml():
+    """Import a TOML parser lazily, preferring the stdlib one
+
+    Returns:
+        The tomllib/tomli module or None if neither is installed
+    """
+    try:
+        import tomllib as tomli  # Python 3.11+
+    except ImportError:
+        try:
+            import tomli
+        except ImportError:
+            return None
+    return tomli
+
+
+@lru_cache(maxsize=None)
+def _parse_pyproject(data: bytes) -> Dict[str, Any]:
+    """Parse pyproject.toml contents, cached per file content"""
+    return _import_toml().loads(data.decode("utf-8"))
+
+
+def find_tool_config(*sections: str) -> Optional[Tuple[Path, str, Dict[str, Any]]]:
+    """Find the nearest pyproject.toml with a non-empty [tool.<section>] table
+
+    Looks in the current directory and then each parent directory. Within a
+    file, sections are tried in the order given. The result is cached per
+    working directory, so CLIs sharing a process search and parse once.
+
+    Args:
+        *sections: Names of the [tool.*] tables to look for
+
+    Returns:
+        Tuple of (pyproject_path, section, config) or None if not found
+    """
+    found = find_tool_tables(*sections)
+    if found is None:
+        return None
+
+    pyproject_path, tables = found
+    section = next(iter(tables))
+    return pyproject_path, section, tables[section]
+
+
+def find_tool_tables(*sections: str) -> Optional[Tuple[Path, Dict[str, Dict[str, Any]]]]:
+    """Find the nearest pyproject.toml with any non-empty [tool.<section>] table
+
+    Like find_tool_config, but returns every non-empty table of the given
+    sections from that file, for tools that merge several of them.
+
+    Args:
+        *sections: Names of the [tool.*] tables to look for
+
+    Returns:
+        Tuple of (pyproject_path, {section: config}) in the order given,
+        or None if not found
+    """
+    return _find_tool_tables(os.getcwd(), sections)
+
+
+@lru_cache(maxsize=None)
+def _find_tool_tables(
+    directory: str, sections: Tuple[str, ...]
+) -> Optional[Tuple[Path, Dict[str, Dict[str, Any]]]]:
+    """Uncached lookup behind find_tool_tables, starting from directory"""
+    if _import_toml() is None:
+        return None
+
+    # Any form of [tool.<section>] has the section name in it, so files that
+    # never mention one are skipped without being parsed
+    needles = [section.encode() for section in sections]
+
+    # Plain string paths and one open() per level; a Path is only built for a hit
+    while True:
+        pyproject_path = os.path.join(directory, "pyproject.toml")
+        try:
+            with open(pyproject_path, "rb") as f:
+                data = f.read()
+            if any(needle in data for needle in needles):
+                tool = _parse_pyproject(data).get("tool", {})
+                tables = {section: tool[section] for section in sections if tool.get(section)}
+                if tables:
+                    return Path(pyproject_path), tables
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        except Exception as e:
+            print(f"Warning: Could not load {pyproject_path}: {e}")
+
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
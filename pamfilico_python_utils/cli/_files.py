@@ -0,0 +1,68 @@
+"""Shared Python file discovery for the CLI entry points
+
+Walks a tree with os.scandir and prunes directories that never hold project
+sources before entering them.
+"""
+
+import os
+from pathlib import Path
+from typing import AbstractSet, Iterator, List
+
+# Default --pattern, matched with a scandir walk instead of Path.glob
+DEFAULT_PATTERN = "**/*.py"
+
+# Directories never worth scanning (virtualenvs, dependencies, caches, VCS metadata).
+# build and dist are left in: they are valid package names
+SKIP_DIRS = frozenset({
+    ".venv", "venv", "node_modules", ".git", "__pycache__", ".tox",
+    ".mypy_cache", ".pytest_cache",
+})
+
+
+def iter_python_files(root: str, skip_dirs: AbstractSet[str] = SKIP_DIRS) -> Iterator[str]:
+    """Yield the .py files under root, in the same order as Path(root).glob("**/*.py")
+
+    Each directory's own matches come before its subdirectories. Directories
+    named in skip_dirs are pruned without being entered.
+
+    Uses one os.scandir per directory; DirEntry caches the file type, so no extra
+    stat calls are needed. Symlinked directories are not followed, as with glob.
+    """
+    subdirs = []
+    try:
+        entries = os.scandir(root)
+    except PermissionError:
+        return  # Unreadable directories are skipped, as with glob
+    with entries:
+        for entry in entries:
+            if entry.name.endswith(".py"):
+                yield entry.path
+            try:
+                if entry.is_dir() and not entry.is_symlink() and entry.name not in skip_dirs:
+                    subdirs.append(entry.path)
+            except OSError:
+                continue
+    for subdir in subdirs:
+        yield from iter_python_files(subdir, skip_dirs)
+
+
+def find_python_files(base: Path, pattern: str, skip_dirs: AbstractSet[str] = SKIP_DIRS) -> List[str]:
+    """Find the files under base matching a glob pattern, outside skip_dirs
+
+    The default pattern uses iter_python_files; any other pattern goes
+    through Path.glob and drops matches below a skipped directory.
+
+    Args:
+        base: Directory the pattern is relative to
+        pattern: Glob pattern, e.g. "**/*.py" or "src/**/*.py"
+        skip_dirs: Directory names to leave out
+
+    Returns:
+        Matching paths as strings, in glob order
+    """
+    if pattern == DEFAULT_PATTERN:
+        return list(iter_python_files(str(base), skip_dirs))
+    return [
+        str(f) for f in base.glob(pattern)
+        if skip_dirs.isdisjoint(f.relative_to(base).parts[:-1])
+    ]
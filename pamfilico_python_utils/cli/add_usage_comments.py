@@ -7,24 +7,61 @@ above each route definition in the backend code.
 """
 
 import argparse
+import os
 import re
 import sys
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
-
-try:
-    import tomli
-except ImportError:
-    try:
-        import tomllib as tomli  # Python 3.11+
-    except ImportError:
-        tomli = None
+from functools import lru_cache
+
+from pamfilico_python_utils.cli._config import find_tool_config
+
+
+# Regex patterns for parsing the route usage markdown reports
+# Route section: "### METHOD `path`" header followed by everything up to the next header
+ROUTE_SECTION_PATTERN = re.compile(
+    r'\n### (DELETE|GET|PATCH|POST|PUT) `([^`]+)`(.*?)(?=\n### (?:DELETE|GET|PATCH|POST|PUT) |\Z)',
+    re.DOTALL,
+)
+BACKEND_LOCATION_PATTERN = re.compile(r'\*\*Backend Location:\*\* `([^:]+):(\d+)`')
+FUNCTION_PATTERN = re.compile(r'\*\*Function:\*\* `([^`]+)`')
+USAGE_LINE_PATTERN = re.compile(r'^- `([^`]+)`\s*$', re.MULTILINE)
+
+# Comment block for routes without any frontend usage
+NO_USAGE_COMMENT = (
+    "# START: ROUTE USAGES TOOL\n"
+    "# No Usages: Please Check Before Deleting\n"
+    "# END: ROUTE USAGES TOOL\n"
+)
+
+# Existing comment blocks (old "USAGES TOOL" or new "ROUTE USAGES TOOL" markers):
+# the START marker alone, and a full block from the first START line to the
+# first END line after it
+START_MARKER_PATTERN = re.compile(r'# START: (?:ROUTE )?USAGES TOOL')
+EXISTING_BLOCK_PATTERN = re.compile(
+    r'^.*# START: (?:ROUTE )?USAGES TOOL.*\n(?:.*\n)*?.*# END: (?:ROUTE )?USAGES TOOL.*$',
+    re.MULTILINE,
+)
 
 
 @dataclass
 class RouteUsage:
     """Represents usage information for a Flask route."""
+    # Explicit slots (dataclass(slots=True) needs Python 3.10+)
+    __slots__ = (
+        'method',
+        'path',
+        'backend_file',
+        'line_number',
+        'function_name',
+        'usage_locations',
+        'has_usage',
+    )
+
     method: str
     path: str
     backend_file: str
@@ -41,31 +78,27 @@ def parse_markdown_file(md_path: Path, has_usage: bool) -> List[RouteUsage]:
     with open(md_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    # Split by route sections (### headers)
-    route_sections = re.split(r'\n### (DELETE|GET|PATCH|POST|PUT) ', content)
-
-    for i in range(1, len(route_sections), 2):
-        if i + 1 >= len(route_sections):
-            break
+    # Nothing to parse if the report has no route section headers
+    if '\n### ' not in content:
+        return routes
 
-        method = route_sections[i]
-        section_content = route_sections[i + 1]
+    # Bind append once - it runs for every route section
+    routes_append = routes.append
 
-        # Extract route path
-        path_match = re.match(r'`([^`]+)`', section_content)
-        if not path_match:
-            continue
-        path = path_match.group(1)
+    # Each match yields the method, route path and the span of the rest of its section
+    for section_match in ROUTE_SECTION_PATTERN.finditer(content):
+        method, path = section_match.group(1, 2)
+        section_start, section_end = section_match.span(3)
 
         # Extract backend location
-        backend_match = re.search(r'\*\*Backend Location:\*\* `([^:]+):(\d+)`', section_content)
+        backend_match = BACKEND_LOCATION_PATTERN.search(content, section_start, section_end)
         if not backend_match:
             continue
         backend_file = backend_match.group(1)
         line_number = int(backend_match.group(2))
 
         # Extract function name
-        func_match = re.search(r'\*\*Function:\*\* `([^`]+)`', section_content)
+        func_match = FUNCTION_PATTERN.search(content, section_start, section_end)
         if not func_match:
             continue
         function_name = func_match.group(1)
@@ -73,18 +106,17 @@ def parse_markdown_file(md_path: Path, has_usage: bool) -> List[RouteUsage]:
         # Extract usage locations
         usage_locations = []
         if has_usage:
-            # Find all frontend file references
-            usage_pattern = r'^- `([^`]+)`\s*$'
-            for line in section_content.split('\n'):
-                match = re.match(usage_pattern, line.strip())
-                if match:
-                    usage_locations.append(match.group(1))
+            # Find all frontend file references in a single scan of the section
+            usage_locations = [
+                match.group(1)
+                for match in USAGE_LINE_PATTERN.finditer(content, section_start, section_end)
+            ]
 
         # If marked as having usage but no locations found, treat as no usage
         # This handles routes in with_usage.md that have no actual frontend calls
         actual_has_usage = has_usage and len(usage_locations) > 0
 
-        routes.append(RouteUsage(
+        routes_append(RouteUsage(
             method=method,
             path=path,
             backend_file=backend_file,
@@ -97,145 +129,203 @@ def parse_markdown_file(md_path: Path, has_usage: bool) -> List[RouteUsage]:
     return routes
 
 
+@lru_cache(maxsize=None)
+def format_location_comment(location: str) -> str:
+    """Format a usage location as a comment line.
+
+    Locations recur across many routes (shared frontend helpers), so the
+    formatted line is cached.
+    """
+    # Extract file path and line number
+    if ':' in location:
+        file_path, line_num = location.rsplit(':', 1)
+        # Format: ./path/to/file.ext:line (workspace-relative)
+        return f"# ./{file_path}:{line_num}"
+    return f"# ./{location}"
+
+
 def generate_comment_block(route: RouteUsage) -> str:
     """Generate the comment block to add above the route definition."""
     if not route.has_usage:
-        return (
-            "# START: ROUTE USAGES TOOL\n"
-            "# No Usages: Please Check Before Deleting\n"
-            "# END: ROUTE USAGES TOOL\n"
-        )
+        return NO_USAGE_COMMENT
 
     # Build multi-line comment with usage locations
     # Use ./ prefix for workspace-relative paths that VSCode recognizes
     lines = ["# START: ROUTE USAGES TOOL"]
     for location in route.usage_locations:
-        # Extract file path and line number
-        if ':' in location:
-            file_path, line_num = location.rsplit(':', 1)
-            # Format: ./path/to/file.ext:line (workspace-relative)
-            lines.append(f"# ./{file_path}:{line_num}")
-        else:
-            lines.append(f"# ./{location}")
+        lines.append(format_location_comment(location))
     lines.append("# END: ROUTE USAGES TOOL")
 
     return '\n'.join(lines) + '\n'
 
 
-def add_comments_to_file(backend_base: Path, routes_by_file: Dict[str, List[RouteUsage]], dry_run: bool = True):
-    """Add usage comments to Flask route files."""
+def index_line_starts(text: str) -> List[int]:
+    """Return the offset of every line start in text, plus a final end-of-text offset.
+
+    Line ``i`` (0-based) spans ``text[line_starts[i]:line_starts[i + 1]]``.
+    """
+    line_starts = [0]
+    pos = text.find('\n')
+    while pos != -1:
+        line_starts.append(pos + 1)
+        pos = text.find('\n', pos + 1)
+    if line_starts[-1] != len(text):
+        line_starts.append(len(text))
+    return line_starts
+
+
+def apply_line_edits(text: str, line_starts: List[int], edits: List[Tuple[int, int, str]]) -> str:
+    """Build the new file content from non-overlapping (start, end, text) edits.
+
+    Each edit replaces lines ``start`` to ``end`` (exclusive) with the given text
+    (an empty range inserts, an empty text deletes). All edits refer to the
+    original line indices, which are mapped to offsets via ``line_starts``.
+    """
+    output: List[str] = []
+    pos = 0
+    for start, end, new_text in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+        start_offset = max(line_starts[start], pos)
+        output.append(text[pos:start_offset])
+        output.append(new_text)
+        pos = max(pos, line_starts[end])
+    output.append(text[pos:])
+    return ''.join(output)
 
-    for rel_path, routes in routes_by_file.items():
-        file_path = backend_base / rel_path
 
-        if not file_path.exists():
-            print(f"⚠️  File not found: {file_path}")
+def add_comments_to_single_file(file_path: str, rel_path: str, routes: List[RouteUsage], dry_run: bool = True) -> List[str]:
+    """Add usage comments to a single Flask route file.
+
+    Returns:
+        Status lines to print for this file
+    """
+    messages: List[str] = []
+
+    if not os.path.isfile(file_path):
+        messages.append(f"⚠️  File not found: {file_path}")
+        return messages
+
+    messages.append(f"\n📝 Processing: {rel_path}")
+
+    # Read the file as a single string and index where each line starts
+    with open(file_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    line_starts = index_line_starts(text)
+    line_count = len(line_starts) - 1
+    # Offsets of every START marker, found in one forward pass over the file
+    start_marker_offsets = [match.start() for match in START_MARKER_PATTERN.finditer(text)]
+
+    # Group routes by line number (multiple routes can point to same line)
+    routes_by_line: Dict[int, List[RouteUsage]] = defaultdict(list)
+    for route in routes:
+        routes_by_line[route.line_number].append(route)
+
+    # Collect all edits against the original line indices and apply them in one pass
+    edits: List[Tuple[int, int, str]] = []
+    # Lowest line touched by an edit so far - scans for routes above must stop there
+    edit_floor = line_count
+
+    # Sort line numbers in reverse order (process routes bottom-up)
+    for line_number in sorted(routes_by_line, reverse=True):
+        line_routes = routes_by_line[line_number]
+        # Adjust for 0-based indexing
+        insert_line = line_number - 1
+
+        if insert_line < 0 or insert_line >= line_count:
+            messages.append(f"  ⚠️  Invalid line number {line_number}")
             continue
 
-        print(f"\n📝 Processing: {rel_path}")
-
-        # Read the file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        # Group routes by line number (multiple routes can point to same line)
-        routes_by_line: Dict[int, List[RouteUsage]] = {}
-        for route in routes:
-            if route.line_number not in routes_by_line:
-                routes_by_line[route.line_number] = []
-            routes_by_line[route.line_number].append(route)
-
-        # Sort line numbers in reverse order (so we don't mess up line numbers)
-        routes_sorted = sorted(routes_by_line.items(), key=lambda x: x[0], reverse=True)
-
-        modified = False
-        for line_number, line_routes in routes_sorted:
-            # Adjust for 0-based indexing
-            insert_line = line_number - 1
-
-            if insert_line < 0 or insert_line >= len(lines):
-                print(f"  ⚠️  Invalid line number {line_number}")
-                continue
-
-            # Merge all usage locations from all routes at this line
-            all_usage_locations = []
-            has_any_usage = False
-            route_descriptions = []
-
-            for route in line_routes:
-                route_descriptions.append(f"{route.method} {route.path}")
-                if route.has_usage:
-                    has_any_usage = True
-                    all_usage_locations.extend(route.usage_locations)
-
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_locations = []
-            for loc in all_usage_locations:
-                if loc not in seen:
-                    seen.add(loc)
-                    unique_locations.append(loc)
-
-            # Check if comment already exists (look for START: USAGES TOOL or START: ROUTE USAGES TOOL marker)
-            check_start = max(0, insert_line - 10)  # Check up to 10 lines above
-            existing_start_line = None
-            existing_end_line = None
-
-            for i in range(check_start, insert_line):
-                if '# START: USAGES TOOL' in lines[i] or '# START: ROUTE USAGES TOOL' in lines[i]:
-                    existing_start_line = i
-                    # Now find the END marker
-                    for j in range(i + 1, min(insert_line + 5, len(lines))):
-                        if '# END: USAGES TOOL' in lines[j] or '# END: ROUTE USAGES TOOL' in lines[j]:
-                            existing_end_line = j
-                            break
-                    break
-
-            # Remove existing comment block if found
-            if existing_start_line is not None and existing_end_line is not None:
-                # Remove the old block (all lines from start to end, inclusive)
-                del lines[existing_start_line:existing_end_line + 1]
-                # Adjust insert line since we removed lines above it
-                insert_line = insert_line - (existing_end_line - existing_start_line + 1)
-                action = "🔄 Replacing"
-            else:
-                action = "✅ Adding new"
-
-            # Generate comment block for merged routes with NEW marker names
-            # Only treat as having usage if there are actual unique locations
-            if has_any_usage and len(unique_locations) > 0:
-                comment_lines = ["# START: ROUTE USAGES TOOL"]
-                for location in unique_locations:
-                    if ':' in location:
-                        location_file, line_num = location.rsplit(':', 1)
-                        comment_lines.append(f"# ./{location_file}:{line_num}")
-                    else:
-                        comment_lines.append(f"# ./{location}")
-                comment_lines.append("# END: ROUTE USAGES TOOL")
-                comment = '\n'.join(comment_lines) + '\n'
-            else:
-                comment = (
-                    "# START: ROUTE USAGES TOOL\n"
-                    "# No Usages: Please Check Before Deleting\n"
-                    "# END: ROUTE USAGES TOOL\n"
-                )
-
-            # Insert the comment
-            lines.insert(insert_line, comment)
-            modified = True
-
-            # Print status
-            routes_str = ", ".join(route_descriptions)
-            print(f"  {action} comment for: {routes_str}")
-
-        # Write back to file
-        if modified:
-            if dry_run:
-                print(f"  🔍 DRY RUN: Would modify {file_path}")
-            else:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
-                print(f"  💾 Saved changes to {file_path}")
+        # Merge all usage locations from all routes at this line
+        all_usage_locations = []
+        has_any_usage = False
+        route_descriptions = []
+
+        for route in line_routes:
+            route_descriptions.append(f"{route.method} {route.path}")
+            if route.has_usage:
+                has_any_usage = True
+                all_usage_locations.extend(route.usage_locations)
+
+        # Remove duplicates while preserving order
+        unique_locations = list(dict.fromkeys(all_usage_locations))
+
+        # Check if comment already exists (look for START: USAGES TOOL or START: ROUTE USAGES TOOL marker)
+        check_start = max(0, insert_line - 10)  # Check up to 10 lines above
+        existing_start_line = None
+        existing_end_line = None
+
+        # START must be above the route line, END may be up to 5 lines below it
+        start_limit = min(insert_line, edit_floor)
+        end_limit = min(insert_line + 5, line_count, edit_floor)
+        # Only run the block search when a START marker lies in the window
+        marker_index = bisect_left(start_marker_offsets, line_starts[check_start])
+        block_match = None
+        if (marker_index < len(start_marker_offsets)
+                and start_marker_offsets[marker_index] < line_starts[start_limit]):
+            marker_line = bisect_right(line_starts, start_marker_offsets[marker_index]) - 1
+            block_match = EXISTING_BLOCK_PATTERN.search(
+                text, line_starts[marker_line], line_starts[end_limit]
+            )
+        if block_match and block_match.start() < line_starts[start_limit]:
+            existing_start_line = bisect_right(line_starts, block_match.start()) - 1
+            existing_end_line = bisect_right(line_starts, block_match.end() - 1) - 1
+
+        # Remove existing comment block if found
+        if existing_start_line is not None and existing_end_line is not None:
+            # Remove the old block (all lines from start to end, inclusive)
+            edits.append((existing_start_line, existing_end_line + 1, ""))
+            edit_floor = min(edit_floor, existing_start_line)
+            # A block ending below the route line shifts the insertion point above it
+            if existing_end_line >= insert_line:
+                insert_line = max(0, insert_line - (existing_end_line - existing_start_line + 1))
+            action = "🔄 Replacing"
+        else:
+            action = "✅ Adding new"
+
+        # Generate comment block for merged routes with NEW marker names
+        # Only treat as having usage if there are actual unique locations
+        if has_any_usage and len(unique_locations) > 0:
+            comment_lines = ["# START: ROUTE USAGES TOOL"]
+            for location in unique_locations:
+                comment_lines.append(format_location_comment(location))
+            comment_lines.append("# END: ROUTE USAGES TOOL")
+            comment = '\n'.join(comment_lines) + '\n'
+        else:
+            comment = NO_USAGE_COMMENT
+
+        # Insert the comment
+        edits.append((insert_line, insert_line, comment))
+        edit_floor = min(edit_floor, insert_line)
+
+        # Record status
+        routes_str = ", ".join(route_descriptions)
+        messages.append(f"  {action} comment for: {routes_str}")
+
+    # Write back to file
+    if edits:
+        # Splice the edits into one buffer; re-runs often reproduce the file exactly
+        new_text = apply_line_edits(text, line_starts, edits)
+        if new_text == text:
+            messages.append(f"  ✅ Already up to date: {file_path}")
+        elif dry_run:
+            messages.append(f"  🔍 DRY RUN: Would modify {file_path}")
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(new_text)
+            messages.append(f"  💾 Saved changes to {file_path}")
+
+    return messages
+
+
+def add_comments_to_file(backend_base: Path, routes_by_file: Dict[str, List[RouteUsage]], dry_run: bool = True):
+    """Add usage comments to Flask route files."""
+    # Plain string paths: os.path is cheaper than Path arithmetic per file
+    base_dir = os.fspath(backend_base)
+
+    # Serial on purpose: each file is a few line edits, and shipping the routes
+    # to worker processes and the messages back costs more than the edits
+    for rel_path, routes in routes_by_file.items():
+        file_path = os.path.join(base_dir, rel_path)
+        print("\n".join(add_comments_to_single_file(file_path, rel_path, routes, dry_run)))
 
 
 def load_config_from_pyproject() -> Optional[Dict[str, Any]]:
@@ -244,39 +334,25 @@ def load_config_from_pyproject() -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary with config or None if not found
     """
-    if tomli is None:
+    # First try specific config for this tool, then the general
+    # flask_route_usage config
+    found = find_tool_config("add_usage_comments", "flask_route_usage")
+    if found is None:
         return None
 
-    # Look for pyproject.toml in current directory or parent directories
-    cwd = Path.cwd()
-    for path in [cwd] + list(cwd.parents):
-        pyproject_path = path / "pyproject.toml"
-        if pyproject_path.exists():
-            try:
-                with open(pyproject_path, "rb") as f:
-                    data = tomli.load(f)
-                    # First try specific config for this tool
-                    config = data.get("tool", {}).get("add_usage_comments", {})
-                    if config:
-                        print(f"📋 Loaded config from: {pyproject_path}")
-                        return config
-                    
-                    # Fall back to general flask_route_usage config
-                    flask_config = data.get("tool", {}).get("flask_route_usage", {})
-                    if flask_config:
-                        # Map flask_route_usage config to add_usage_comments format
-                        mapped_config = {
-                            "backend_path": flask_config.get("backend", "./"),
-                            "with_usage_report": "flask_routes_with_usage.md",
-                            "without_usage_report": "flask_routes_without_usage.md"
-                        }
-                        print(f"📋 Loaded config from: {pyproject_path} (flask_route_usage)")
-                        return mapped_config
-            except Exception as e:
-                print(f"Warning: Could not load {pyproject_path}: {e}")
-                continue
-
-    return None
+    pyproject_path, section, config = found
+    if section == "add_usage_comments":
+        print(f"📋 Loaded config from: {pyproject_path}")
+        return config
+
+    # Map flask_route_usage config to add_usage_comments format
+    mapped_config = {
+        "backend_path": config.get("backend", "./"),
+        "with_usage_report": "flask_routes_with_usage.md",
+        "without_usage_report": "flask_routes_without_usage.md"
+    }
+    print(f"📋 Loaded config from: {pyproject_path} (flask_route_usage)")
+    return mapped_config
 
 
 def parse_arguments():
@@ -377,9 +453,12 @@ def main():
 
     print("🔍 Parsing markdown files...")
 
-    # Parse both markdown files
-    routes_with_usage = parse_markdown_file(with_usage_md, has_usage=True)
-    routes_without_usage = parse_markdown_file(without_usage_md, has_usage=False)
+    # Parse both markdown files concurrently (independent reads and parses)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with_usage_future = executor.submit(parse_markdown_file, with_usage_md, True)
+        without_usage_future = executor.submit(parse_markdown_file, without_usage_md, False)
+        routes_with_usage = with_usage_future.result()
+        routes_without_usage = without_usage_future.result()
 
     all_routes = routes_with_usage + routes_without_usage
 
@@ -388,10 +467,8 @@ def main():
     print(f"✅ Total: {len(all_routes)} routes")
 
     # Group routes by file
-    routes_by_file: Dict[str, List[RouteUsage]] = {}
+    routes_by_file: Dict[str, List[RouteUsage]] = defaultdict(list)
     for route in all_routes:
-        if route.backend_file not in routes_by_file:
-            routes_by_file[route.backend_file] = []
         routes_by_file[route.backend_file].append(route)
 
     print(f"\n📂 Will modify {len(routes_by_file)} files")
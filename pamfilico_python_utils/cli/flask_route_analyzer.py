@@ -4,9 +4,13 @@ This module provides the core functionality for analyzing Flask routes
 and finding their usage across frontend applications.
 """
 
+import os
 import re
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, AnyStr, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 
@@ -28,15 +32,79 @@ class RouteInfo:
         return f"{self.blueprint_prefix}{self.path}"
 
 
-@dataclass
-class UsageInfo:
-    """Information about a route usage in frontend"""
+class UsageInfo(NamedTuple):
+    """Information about a route usage in frontend
+
+    A tuple rather than a dataclass: one is created per API call found, and
+    tuples are compact, hashable and cheap to pickle back from scan workers.
+    """
 
     file_path: str
     line_number: int
     line_content: str
 
 
+class UsageTrie:
+    """Prefix trie of frontend usage paths, one tree per HTTP method
+
+    Paths are stored segment by segment, so matching a route only visits
+    usages with the same static prefix and segment count.
+    """
+
+    __slots__ = ("_roots", "_paths")
+
+    class _Node:
+        __slots__ = ("children", "values")
+
+        def __init__(self) -> None:
+            self.children: Dict[str, "UsageTrie._Node"] = {}
+            self.values: List[Any] = []
+
+    def __init__(self) -> None:
+        self._roots: Dict[str, "UsageTrie._Node"] = {}
+        # Terminal node of every stored path, for routes without dynamic segments
+        self._paths: Dict[Tuple[str, Tuple[str, ...]], "UsageTrie._Node"] = {}
+
+    def insert(self, method: str, segments: List[str], value: Any) -> None:
+        """Store value under the usage path made of segments"""
+        node = self._roots.get(method)
+        if node is None:
+            node = self._roots[method] = self._Node()
+        for segment in segments:
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = self._Node()
+            node = child
+        node.values.append(value)
+        self._paths[(method, tuple(segments))] = node
+
+    def match(self, method: str, route_segments: List[str]) -> List[Any]:
+        """Get values of all usage paths matching the route segments
+
+        Flask dynamic parameters (<type:name> or <name>) match any usage
+        segment; static segments must match exactly.
+        """
+        dynamic = [seg.startswith("<") and seg.endswith(">") for seg in route_segments]
+        if not any(dynamic):
+            # Static route: a single lookup instead of a walk
+            node = self._paths.get((method, tuple(route_segments)))
+            return list(node.values) if node is not None else []
+
+        root = self._roots.get(method)
+        if root is None:
+            return []
+
+        nodes = [root]
+        for route_seg, is_dynamic in zip(route_segments, dynamic):
+            if is_dynamic:
+                nodes = [child for node in nodes for child in node.children.values()]
+            else:
+                nodes = [node.children[route_seg] for node in nodes if route_seg in node.children]
+            if not nodes:
+                return []
+        return [value for node in nodes for value in node.values]
+
+
 class FlaskRouteAnalyzer:
     """Analyzes Flask routes and their frontend usage"""
 
@@ -45,6 +113,9 @@ class FlaskRouteAnalyzer:
         r'@(?P<blueprint>\w+)\.route\(["\'](?P<path>[^"\']+)["\'](?:,\s*methods=\[(?P<methods>[^\]]+)\])?'
     )
     FUNCTION_PATTERN = re.compile(r"def\s+(\w+)\s*\(")
+    # Start of a route decorator for one of the known blueprints
+    ROUTE_DECORATOR_PATTERN = re.compile(r"@(?:api|aade_bp)\.route\(")
+    ROUTE_DECORATOR_NEEDLES = (b"@api.route(", b"@aade_bp.route(")
 
     # Regex patterns for frontend API calls
     AXIOS_PATTERN = re.compile(
@@ -52,29 +123,50 @@ class FlaskRouteAnalyzer:
     )
     FETCH_PATTERN = re.compile(r'fetch\s*\(\s*[`"\'](?P<url>[^`"\']+)[`"\']')
 
-    # Regex patterns for wrapper function calls (from @/actions/*)
-    # Matches: get<Type>('/api/...', ...) or get('/api/...', ...)
-    WRAPPER_GET_PATTERN = re.compile(
-        r'\bget\s*(?:<[^>]+>)?\s*\(\s*[`"\'](?P<url>[^`"\']+)[`"\']'
-    )
-    WRAPPER_POST_PATTERN = re.compile(
-        r'\bpost\s*(?:<[^>]+>)?\s*\(\s*[`"\'](?P<url>[^`"\']+)[`"\']'
-    )
-    WRAPPER_PUT_PATTERN = re.compile(
-        r'\bput\s*(?:<[^>]+>)?\s*\(\s*[`"\'](?P<url>[^`"\']+)[`"\']'
-    )
-    WRAPPER_DELETE_PATTERN = re.compile(
-        r'\bdelete\s*(?:<[^>]+>)?\s*\(\s*[`"\'](?P<url>[^`"\']+)[`"\']'
+    # Call patterns below are bytes patterns: frontend files are scanned undecoded.
+    # Non-ASCII bytes count as identifier characters, as \w does for decoded text.
+    # Whitespace runs are matched by a single \s* so failed matches don't backtrack
+    # over every way of splitting them.
+
+    # Regex pattern for wrapper function calls (from @/actions/*)
+    # Matches: get<Type>('/api/...', ...) or post('/api/...', ...) - one pass for all methods
+    WRAPPER_PATTERN = re.compile(
+        rb'(?<![\w\x80-\xff])(?P<method>get|post|put|delete)\s*(?:<[^>]+>\s*)?\(\s*[`"\'](?P<url>[^`"\']+)[`"\']'
     )
 
     # Regex patterns for axios instance calls (e.g., apiClient.get(), client.post())
     # Matches: someIdentifier.get('/api/...', ...) or someIdentifier.post('/api/...', ...)
     AXIOS_INSTANCE_PATTERN = re.compile(
-        r'\b\w+\.(?P<method>get|post|put|delete|patch)\s*(?:<[^>]+>)?\s*\(\s*[`"\'](?P<url>[^`"\']+)[`"\']'
+        rb'(?<![\w\x80-\xff])[\w\x80-\xff]+\.(?P<method>get|post|put|delete|patch)\s*(?:<[^>]+>\s*)?\(\s*[`"\'](?P<url>[^`"\']+)[`"\']'
+    )
+
+    # Multi-line axios/fetch calls (\s also matches newlines)
+    # Handles: axios.get(), axios\n.get(), axios.get(\nurl), axios\n.get(\nurl)
+    MULTILINE_AXIOS_PATTERN = re.compile(
+        rb'axios\s*\.(?P<method>get|post|put|delete|patch)\s*\(\s*[`"\'](?P<url>[^`"\']+)[`"\']',
+        re.MULTILINE,
     )
+    MULTILINE_FETCH_PATTERN = re.compile(
+        rb'fetch\s*\(\s*[`"\'](?P<url>[^`"\']+)[`"\']', re.MULTILINE
+    )
+
+    # Method option near a fetch call (e.g. { method: "POST" })
+    FETCH_POST_METHOD_PATTERN = re.compile(rb'method\s*:\s*["\']POST["\']', re.IGNORECASE)
+    FETCH_PUT_METHOD_PATTERN = re.compile(rb'method\s*:\s*["\']PUT["\']', re.IGNORECASE)
+    FETCH_DELETE_METHOD_PATTERN = re.compile(rb'method\s*:\s*["\']DELETE["\']', re.IGNORECASE)
+    FETCH_PATCH_METHOD_PATTERN = re.compile(rb'method\s*:\s*["\']PATCH["\']', re.IGNORECASE)
 
     TEMPLATE_VAR_PATTERN = re.compile(r"\$\{[^}]+\}")
 
+    # Backend base URL template variables (${BACKEND_URL}, ${API_DOMAIN}, ...) in usage paths
+    BACKEND_URL_VAR_PATTERN = re.compile(r"\$\{(?:BACKEND[^}]*|[^}]*(?:DOMAIN|URL)[^}]*)\}/?")
+
+    # Frontend source file extensions to scan
+    FRONTEND_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx")
+
+    # Directories never worth scanning (dependencies, build output, VCS metadata)
+    SKIP_DIRS = frozenset({"node_modules", ".next", "dist", ".git"})
+
     # Known blueprint prefixes
     BLUEPRINT_PREFIXES = {
         "api": "/api/v1",
@@ -106,113 +198,174 @@ class FlaskRouteAnalyzer:
             return
 
         # Process all Python files in API directory
-        for py_file in api_path.rglob("*.py"):
-            if py_file.name == "__init__.py":
-                continue
-
-            self._extract_routes_from_file(py_file)
+        py_files = [
+            py_file
+            for py_file in self._find_files(api_path, (".py",))
+            if py_file.name != "__init__.py"
+        ]
+        results = self._map_files(
+            type(self)._scan_routes_file,
+            py_files,
+            repeat(self.backend_root),
+            repeat(self.BLUEPRINT_PREFIXES),
+        )
+        for py_file, (routes, error) in zip(py_files, results):
+            self.routes.extend(routes)
+            if error:
+                print(f"Error processing {py_file}: {error}")
 
         print(f"Found {len(self.routes)} routes in backend")
         
         if self.verbose and self.routes:
             self._debug_show_sample_routes()
 
-    def _extract_routes_from_file(self, file_path: Path) -> None:
-        """Extract routes from a single Python file"""
+    @staticmethod
+    def _map_files(func: Callable, file_paths: List[Path], *args: Iterable) -> List:
+        """Map func over per-file arguments, using worker processes for multiple files
+
+        Results are returned in the order of file_paths.
+        """
+        if len(file_paths) > 1:
+            with ProcessPoolExecutor() as executor:
+                return list(executor.map(func, file_paths, *args, chunksize=32))
+        return list(map(func, file_paths, *args))
+
+    def _find_files(self, root: Path, extensions: Tuple[str, ...]) -> List[Path]:
+        """Find files with the given extensions under root in a single directory walk
+
+        Results are grouped by extension in the given order. Directories in
+        SKIP_DIRS are pruned without being visited.
+        """
+        files_by_extension: Dict[str, List[Path]] = {ext: [] for ext in extensions}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in self.SKIP_DIRS]
+            for filename in filenames:
+                matching_files = files_by_extension.get(os.path.splitext(filename)[1])
+                if matching_files is not None:
+                    matching_files.append(Path(dirpath, filename))
+        return [file_path for ext in extensions for file_path in files_by_extension[ext]]
+
+    @classmethod
+    def _scan_routes_file(
+        cls, file_path: Path, backend_root: Path, blueprint_prefixes: Dict[str, str]
+    ) -> Tuple[List[RouteInfo], Optional[str]]:
+        """Extract routes from a single Python file
+
+        Runs in worker processes, so results are returned instead of stored.
+
+        Returns:
+            Tuple of (routes found, error message or None)
+        """
+        routes: List[RouteInfo] = []
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            with open(file_path, "rb") as f:
+                data = f.read()
 
-            i = 0
-            while i < len(lines):
-                line = lines[i]
-
-                # Look for route decorator start - find the FIRST route decorator for a function
-                if "@api.route(" in line or "@aade_bp.route(" in line:
-                    # Track the line where decorators start (for comment placement)
-                    first_decorator_line = i
-                    all_routes = []  # Collect all route decorators for this function
-
-                    # Process all consecutive route decorators
-                    j = i
-                    while j < len(lines):
-                        current_line = lines[j]
-
-                        # Check if this is a route decorator
-                        if "@api.route(" in current_line or "@aade_bp.route(" in current_line:
-                            # Collect the full decorator (might span multiple lines)
-                            decorator_lines = [current_line]
-                            k = j + 1
-
-                            # If the line doesn't end with a closing paren, collect continuation lines
-                            if ")" not in current_line or current_line.rstrip().endswith("("):
-                                while k < len(lines):
-                                    decorator_lines.append(lines[k])
-                                    if ")" in lines[k]:
-                                        k += 1
-                                        break
-                                    k += 1
+            # Most modules define no routes, skip them before decoding anything
+            if not any(needle in data for needle in cls.ROUTE_DECORATOR_NEEDLES):
+                return routes, None
+
+            content = data.decode("utf-8")
+            if "\r" in content:
+                # Same universal newline handling as text mode
+                content = content.replace("\r\n", "\n").replace("\r", "\n")
 
-                            # Join all decorator lines into a single string for regex matching
-                            full_decorator = " ".join(l.strip() for l in decorator_lines)
-
-                            # Try to match the full decorator
-                            route_match = self.ROUTE_PATTERN.search(full_decorator)
-                            if route_match:
-                                all_routes.append((route_match, len(decorator_lines)))
-
-                            # Move past this decorator
-                            j = k if k > j + 1 else j + 1
-                        elif current_line.strip().startswith("@"):
-                            # Other decorator (not a route), skip it
-                            j += 1
-                        else:
-                            # Not a decorator - must be the function definition
-                            break
-
-                    # Find the function name
-                    function_name = "unknown"
-                    func_match = self.FUNCTION_PATTERN.search(lines[j] if j < len(lines) else "")
-                    if func_match:
-                        function_name = func_match.group(1)
-
-                    # Create route info for all routes found
-                    for route_match, _ in all_routes:
-                        blueprint = route_match.group("blueprint")
-                        path = route_match.group("path")
-                        methods_str = route_match.group("methods")
-
-                        # Parse methods
-                        methods = ["GET"]  # Default method
-                        if methods_str:
-                            methods = [m.strip(" \"'") for m in methods_str.split(",")]
-
-                        # Get blueprint prefix
-                        blueprint_prefix = self.BLUEPRINT_PREFIXES.get(blueprint, "/api/v1")
-
-                        # Create route info for each method - ALL use the FIRST decorator line number
-                        for method in methods:
-                            route_info = RouteInfo(
-                                method=method,
-                                path=path,
-                                file_path=str(file_path.relative_to(self.backend_root)),
-                                line_number=first_decorator_line + 1,  # All routes use first line
-                                function_name=function_name,
-                                blueprint_prefix=blueprint_prefix,
-                            )
-                            self.routes.append(route_info)
-
-                    # Skip past this entire function definition (all decorators + function line)
-                    i = j + 1
+            newline_offsets = cls._newline_offsets(content)
+            lines = content.split("\n")
+            rel_path = str(file_path.relative_to(backend_root))
+
+            # Jump from one route decorator to the next instead of testing every line
+            i = 0
+            for decorator_match in cls.ROUTE_DECORATOR_PATTERN.finditer(content):
+                # Track the line where decorators start (for comment placement)
+                first_decorator_line = bisect_right(newline_offsets, decorator_match.start())
+                if first_decorator_line < i:
+                    # Already handled with the previous function's decorators
                     continue
 
-                i += 1
+                all_routes = []  # Collect all route decorators for this function
+
+                # Process all consecutive route decorators
+                j = first_decorator_line
+                while j < len(lines):
+                    current_line = lines[j]
+
+                    # Check if this is a route decorator
+                    if cls.ROUTE_DECORATOR_PATTERN.search(current_line):
+                        # Collect the full decorator (might span multiple lines)
+                        decorator_lines = [current_line]
+                        k = j + 1
+
+                        # If the line doesn't end with a closing paren, collect continuation lines
+                        if ")" not in current_line or current_line.rstrip().endswith("("):
+                            while k < len(lines):
+                                decorator_lines.append(lines[k])
+                                if ")" in lines[k]:
+                                    k += 1
+                                    break
+                                k += 1
+
+                        # Join all decorator lines into a single string for regex matching
+                        full_decorator = " ".join(l.strip() for l in decorator_lines)
+
+                        # Try to match the full decorator
+                        route_match = cls.ROUTE_PATTERN.search(full_decorator)
+                        if route_match:
+                            all_routes.append((route_match, len(decorator_lines)))
+
+                        # Move past this decorator
+                        j = k if k > j + 1 else j + 1
+                    elif current_line.strip().startswith("@"):
+                        # Other decorator (not a route), skip it
+                        j += 1
+                    else:
+                        # Not a decorator - must be the function definition
+                        break
+
+                # Find the function name
+                function_name = "unknown"
+                func_match = cls.FUNCTION_PATTERN.search(lines[j] if j < len(lines) else "")
+                if func_match:
+                    function_name = func_match.group(1)
+
+                # Create route info for all routes found
+                for route_match, _ in all_routes:
+                    blueprint = route_match.group("blueprint")
+                    path = route_match.group("path")
+                    methods_str = route_match.group("methods")
+
+                    # Parse methods
+                    methods = ["GET"]  # Default method
+                    if methods_str:
+                        methods = [m.strip(" \"'") for m in methods_str.split(",")]
+
+                    # Get blueprint prefix
+                    blueprint_prefix = blueprint_prefixes.get(blueprint, "/api/v1")
+
+                    # Create route info for each method - ALL use the FIRST decorator line number
+                    for method in methods:
+                        route_info = RouteInfo(
+                            method=method,
+                            path=path,
+                            file_path=rel_path,
+                            line_number=first_decorator_line + 1,  # All routes use first line
+                            function_name=function_name,
+                            blueprint_prefix=blueprint_prefix,
+                        )
+                        routes.append(route_info)
+
+                # Skip past this entire function definition (all decorators + function line)
+                i = j + 1
 
         except Exception as e:
-            print(f"Error processing {file_path}: {e}")
+            return routes, str(e)
+
+        return routes, None
 
     def extract_frontend_usages(self) -> None:
         """Extract API calls from frontend files"""
+        file_paths: List[Path] = []
+        file_roots: List[Path] = []
         for frontend_root in self.frontend_roots:
             if not frontend_root.exists():
                 print(f"Warning: Frontend path not found: {frontend_root}")
@@ -223,141 +376,175 @@ class FlaskRouteAnalyzer:
                 print(f"Warning: Source path not found: {src_path}")
                 continue
 
-            # Process TypeScript/JavaScript files
-            for ext in ["*.ts", "*.tsx", "*.js", "*.jsx"]:
-                for file_path in src_path.rglob(ext):
-                    self._extract_usages_from_file(file_path, frontend_root)
+            # Collect TypeScript/JavaScript files
+            for file_path in self._find_files(src_path, self.FRONTEND_EXTENSIONS):
+                file_paths.append(file_path)
+                file_roots.append(frontend_root)
+
+        # Files are scanned independently, so spread them over worker processes
+        results = self._map_files(type(self)._scan_usages_file, file_paths, file_roots)
+        for file_path, (usages, error) in zip(file_paths, results):
+            for key, usage in usages:
+                self.usages[key].append(usage)
+            if error:
+                print(f"Error processing {file_path}: {error}")
 
         print(f"Found {sum(len(v) for v in self.usages.values())} frontend API calls")
         
         if self.verbose and self.usages:
             self._debug_show_sample_usages()
 
-    def _extract_usages_from_file(self, file_path: Path, frontend_root: Path) -> None:
-        """Extract API calls from a single frontend file"""
+    @classmethod
+    def _scan_usages_file(
+        cls, file_path: Path, frontend_root: Path
+    ) -> Tuple[List[Tuple[str, UsageInfo]], Optional[str]]:
+        """Extract API calls from a single frontend file
+
+        Runs in worker processes, so results are returned instead of stored.
+
+        Returns:
+            Tuple of ((usage key, usage) pairs found, error message or None)
+        """
+        usages: List[Tuple[str, UsageInfo]] = []
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
+            # Scan raw bytes and decode only what ends up in a usage
+            with open(file_path, "rb") as f:
                 content = f.read()
-                lines = content.split("\n")
-
-            # Try to find multi-line axios/fetch calls
-            # Pattern for axios.method( followed by URL on next lines
-            # Handles: axios.get(), axios\n.get(), axios.get(\nurl), axios\n.get(\nurl)
-            multiline_axios_pattern = re.compile(
-                r'axios\s*\n?\s*\.(?P<method>get|post|put|delete|patch)\s*\(\s*\n?\s*[`"\'](?P<url>[^`"\']+)[`"\']',
-                re.MULTILINE,
-            )
-            multiline_fetch_pattern = re.compile(
-                r'fetch\s*\(\s*\n?\s*[`"\'](?P<url>[^`"\']+)[`"\']', re.MULTILINE
-            )
+            if b"\r" in content:
+                # Same universal newline handling as text mode
+                content = content.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+            # Offsets of every newline, so match positions map to line numbers by bisection
+            newline_offsets = cls._newline_offsets(content)
+            rel_path = str(file_path.relative_to(frontend_root.parent))
 
             # Find all multi-line axios matches
-            for match in multiline_axios_pattern.finditer(content):
-                url = match.group("url")
-                method = match.group("method").upper()
+            for match in cls.MULTILINE_AXIOS_PATTERN.finditer(content):
+                url = match.group("url").decode("utf-8", "replace")
+                method = match.group("method").decode().upper()
 
                 # Find line number
-                line_num = content[: match.start()].count("\n") + 1
+                line_num = bisect_right(newline_offsets, match.start()) + 1
 
                 usage = UsageInfo(
-                    file_path=str(file_path.relative_to(frontend_root.parent)),
+                    file_path=rel_path,
                     line_number=line_num,
-                    line_content=(
-                        lines[line_num - 1].strip() if line_num <= len(lines) else ""
-                    ),
+                    line_content=cls._line_text(content, newline_offsets, line_num),
                 )
 
                 key = f"{method} {url}"
-                self.usages[key].append(usage)
+                usages.append((key, usage))
 
             # Find all multi-line fetch matches
-            for match in multiline_fetch_pattern.finditer(content):
-                url = match.group("url")
+            for match in cls.MULTILINE_FETCH_PATTERN.finditer(content):
+                url = match.group("url").decode("utf-8", "replace")
 
                 # Find line number
-                line_num = content[: match.start()].count("\n") + 1
+                line_num = bisect_right(newline_offsets, match.start()) + 1
 
                 # Try to determine method (look for method: in nearby content)
                 method = "GET"
-                context_start = max(0, match.start() - 200)
-                context_end = min(len(content), match.end() + 200)
-                context = content[context_start:context_end]
+                context = cls._surrounding_text(content, match.start(), match.end(), 200)
 
-                if re.search(r'method\s*:\s*["\']POST["\']', context, re.IGNORECASE):
+                if cls.FETCH_POST_METHOD_PATTERN.search(context):
                     method = "POST"
-                elif re.search(r'method\s*:\s*["\']PUT["\']', context, re.IGNORECASE):
+                elif cls.FETCH_PUT_METHOD_PATTERN.search(context):
                     method = "PUT"
-                elif re.search(
-                    r'method\s*:\s*["\']DELETE["\']', context, re.IGNORECASE
-                ):
+                elif cls.FETCH_DELETE_METHOD_PATTERN.search(context):
                     method = "DELETE"
-                elif re.search(r'method\s*:\s*["\']PATCH["\']', context, re.IGNORECASE):
+                elif cls.FETCH_PATCH_METHOD_PATTERN.search(context):
                     method = "PATCH"
 
                 usage = UsageInfo(
-                    file_path=str(file_path.relative_to(frontend_root.parent)),
+                    file_path=rel_path,
                     line_number=line_num,
-                    line_content=(
-                        lines[line_num - 1].strip() if line_num <= len(lines) else ""
-                    ),
+                    line_content=cls._line_text(content, newline_offsets, line_num),
                 )
 
                 key = f"{method} {url}"
-                self.usages[key].append(usage)
+                usages.append((key, usage))
 
             # Find wrapper function calls (get, post, put, delete from @/actions/*)
             # These are TypeScript wrapper functions that internally call axios
-            wrapper_patterns = [
-                (self.WRAPPER_GET_PATTERN, "GET"),
-                (self.WRAPPER_POST_PATTERN, "POST"),
-                (self.WRAPPER_PUT_PATTERN, "PUT"),
-                (self.WRAPPER_DELETE_PATTERN, "DELETE"),
-            ]
-
-            for pattern, method in wrapper_patterns:
-                for match in pattern.finditer(content):
-                    url = match.group("url")
-
-                    # Find line number
-                    line_num = content[: match.start()].count("\n") + 1
-
-                    usage = UsageInfo(
-                        file_path=str(file_path.relative_to(frontend_root.parent)),
-                        line_number=line_num,
-                        line_content=(
-                            lines[line_num - 1].strip() if line_num <= len(lines) else ""
-                        ),
-                    )
-
-                    key = f"{method} {url}"
-                    self.usages[key].append(usage)
+            for match in cls.WRAPPER_PATTERN.finditer(content):
+                url = match.group("url").decode("utf-8", "replace")
+                method = match.group("method").decode().upper()
+
+                # Find line number
+                line_num = bisect_right(newline_offsets, match.start()) + 1
+
+                usage = UsageInfo(
+                    file_path=rel_path,
+                    line_number=line_num,
+                    line_content=cls._line_text(content, newline_offsets, line_num),
+                )
+
+                key = f"{method} {url}"
+                usages.append((key, usage))
 
             # Find axios instance calls (e.g., apiClient.get(), aiServiceClient.post())
             # These are axios instance method calls that are very common in modern projects
-            for match in self.AXIOS_INSTANCE_PATTERN.finditer(content):
-                url = match.group("url")
-                method = match.group("method").upper()
+            for match in cls.AXIOS_INSTANCE_PATTERN.finditer(content):
+                url = match.group("url").decode("utf-8", "replace")
+                method = match.group("method").decode().upper()
 
                 # Find line number
-                line_num = content[: match.start()].count("\n") + 1
+                line_num = bisect_right(newline_offsets, match.start()) + 1
 
                 usage = UsageInfo(
-                    file_path=str(file_path.relative_to(frontend_root.parent)),
+                    file_path=rel_path,
                     line_number=line_num,
-                    line_content=(
-                        lines[line_num - 1].strip() if line_num <= len(lines) else ""
-                    ),
+                    line_content=cls._line_text(content, newline_offsets, line_num),
                 )
 
                 key = f"{method} {url}"
-                self.usages[key].append(usage)
+                usages.append((key, usage))
 
         except Exception as e:
-            print(f"Error processing {file_path}: {e}")
+            return usages, str(e)
+
+        return usages, None
+
+    @staticmethod
+    def _line_text(content: bytes, newline_offsets: List[int], line_num: int) -> str:
+        """Get the stripped text of a 1-based line, sliced out of content on demand"""
+        start = newline_offsets[line_num - 2] + 1 if line_num > 1 else 0
+        end = newline_offsets[line_num - 1] if line_num <= len(newline_offsets) else len(content)
+        return content[start:end].decode("utf-8", "replace").strip()
+
+    @staticmethod
+    def _surrounding_text(content: bytes, start: int, end: int, chars: int) -> bytes:
+        """Get content[start:end] plus up to chars characters of UTF-8 text on each side"""
+        # A UTF-8 character is at most 4 bytes, so only non-ASCII margins need decoding
+        span = chars * 4 + 3
+        before = content[max(0, start - span):start]
+        after = content[end:end + span]
+        if before.isascii():
+            before = before[-chars:]
+        else:
+            before = before.decode("utf-8", "ignore")[-chars:].encode("utf-8")
+        if after.isascii():
+            after = after[:chars]
+        else:
+            after = after.decode("utf-8", "ignore")[:chars].encode("utf-8")
+        return before + content[start:end] + after
+
+    @staticmethod
+    def _newline_offsets(content: AnyStr) -> List[int]:
+        """Return the offset of every newline character in content (str or bytes)"""
+        newline = b"\n" if isinstance(content, bytes) else "\n"
+        offsets = []
+        pos = content.find(newline)
+        while pos != -1:
+            offsets.append(pos)
+            pos = content.find(newline, pos + 1)
+        return offsets
 
     def match_routes_to_usages(self) -> Dict[RouteInfo, List[UsageInfo]]:
         """Match Flask routes to their frontend usages"""
         matched: Dict[RouteInfo, List[UsageInfo]] = {}
+        usage_keys = list(self.usages)
+        trie = self._build_usage_trie(usage_keys)
 
         for route in self.routes:
             route_usages = []
@@ -366,93 +553,49 @@ class FlaskRouteAnalyzer:
             # Try exact match first
             if route_key in self.usages:
                 route_usages.extend(self.usages[route_key])
+            seen = set(route_usages)
 
-            # Try fuzzy matching for dynamic routes
-            for usage_key, usages in self.usages.items():
-                if self._routes_match(route, usage_key):
-                    # Avoid duplicates
-                    for usage in usages:
-                        if usage not in route_usages:
-                            route_usages.append(usage)
+            # Try fuzzy matching for dynamic routes, against both the full route path
+            # and the path without blueprint prefix (axios baseURL scenario)
+            key_indexes = set(trie.match(route.method, self._path_segments(route.full_path)))
+            if route.path != route.full_path:
+                key_indexes.update(trie.match(route.method, self._path_segments(route.path)))
+
+            # Keep usage discovery order, avoiding duplicates
+            for key_index in sorted(key_indexes):
+                for usage in self.usages[usage_keys[key_index]]:
+                    if usage not in seen:
+                        seen.add(usage)
+                        route_usages.append(usage)
 
             matched[route] = route_usages
 
         return matched
 
-    def _routes_match(self, route: RouteInfo, usage_key: str) -> bool:
-        """Check if a route matches a usage key using fuzzy matching"""
-        # Parse usage key
-        parts = usage_key.split(" ", 1)
-        if len(parts) != 2:
-            return False
-
-        usage_method, usage_path = parts
-
-        # Check method
-        if route.method != usage_method:
-            return False
-
-        # Exact match
-        if route.full_path == usage_path:
-            return True
-
-        # Remove BACKEND_DOMAIN/BACKEND_URL variables from usage path
-        usage_path_clean = re.sub(r"\$\{BACKEND[^}]*\}/?", "", usage_path)
-        usage_path_clean = re.sub(r"\$\{[^}]*DOMAIN[^}]*\}/?", "", usage_path_clean)
-        usage_path_clean = re.sub(r"\$\{[^}]*URL[^}]*\}/?", "", usage_path_clean)
-
-        # Check if cleaned path matches route
-        if route.full_path == usage_path_clean:
-            return True
-
-        # Handle axios baseURL scenario - frontend calls may not have /api/v1 prefix
-        # Try matching route without blueprint prefix against usage path
-        route_without_prefix = route.path  # This is the path without blueprint prefix
-        if route_without_prefix == usage_path_clean:
-            return True
-        
-        # Also try with leading slash added to usage path (common pattern)
-        if not usage_path_clean.startswith('/'):
-            usage_with_slash = '/' + usage_path_clean
-            if route.full_path == usage_with_slash or route_without_prefix == usage_with_slash:
-                return True
-
-        # Segment-by-segment matching with dynamic parameters
-        # Try both full route path and route path without blueprint prefix
-        paths_to_try = [route.full_path]
-        if route.path != route.full_path:
-            paths_to_try.append(route.path)
-        
-        for route_path_to_test in paths_to_try:
-            route_segments = [s for s in route_path_to_test.split("/") if s]
-            usage_segments = [s for s in usage_path_clean.split("/") if s]
-
-            if len(route_segments) != len(usage_segments):
-                continue  # Try next path variant
-
-            matches = True
-            for route_seg, usage_seg in zip(route_segments, usage_segments):
-                # Flask dynamic parameter pattern: <type:name> or <name>
-                if route_seg.startswith("<") and route_seg.endswith(">"):
-                    # Dynamic segment - check if usage has template variable or dynamic content
-                    if "${" in usage_seg or "{" in usage_seg:
-                        # Has template variable, counts as match
-                        continue
-                    # Allow any non-empty segment as dynamic match (literal values)
-                    if usage_seg:
-                        continue
-                    matches = False
-                    break
-                else:
-                    # Static segment - must match exactly
-                    if route_seg != usage_seg:
-                        matches = False
-                        break
-            
-            if matches:
-                return True
+    def _build_usage_trie(self, usage_keys: List[str]) -> "UsageTrie":
+        """Index cleaned usage paths by method and path segment
+
+        Trie values are positions in usage_keys.
+        """
+        trie = UsageTrie()
+        for key_index, usage_key in enumerate(usage_keys):
+            # Parse usage key
+            parts = usage_key.split(" ", 1)
+            if len(parts) != 2:
+                continue
+
+            usage_method, usage_path = parts
+
+            # Remove BACKEND_DOMAIN/BACKEND_URL variables from usage path
+            usage_path_clean = self.BACKEND_URL_VAR_PATTERN.sub("", usage_path)
 
-        return False
+            trie.insert(usage_method, self._path_segments(usage_path_clean), key_index)
+        return trie
+
+    @staticmethod
+    def _path_segments(path: str) -> List[str]:
+        """Split a URL path into its non-empty segments"""
+        return [s for s in path.split("/") if s]
 
     def _debug_show_sample_routes(self) -> None:
         """Show sample routes found for debugging"""
@@ -490,134 +633,134 @@ class FlaskRouteAnalyzer:
         """Generate two separate markdown reports: routes with usage and routes without usage"""
         matched = self.match_routes_to_usages()
 
-        # Separate routes into used and unused
-        routes_with_usage_list = [
-            (r, usages) for r, usages in matched.items() if usages
-        ]
-        routes_without_usage_list = [
-            (r, usages) for r, usages in matched.items() if not usages
-        ]
+        # Separate routes into used and unused, grouped by method for both reports
+        used_by_method: Dict[str, List[Tuple[RouteInfo, List[UsageInfo]]]] = defaultdict(list)
+        unused_by_method: Dict[str, List[RouteInfo]] = defaultdict(list)
+        for route, usages in matched.items():
+            if usages:
+                used_by_method[route.method].append((route, usages))
+            else:
+                unused_by_method[route.method].append(route)
+
+        # Sort routes by path within each method
+        for routes_list in used_by_method.values():
+            routes_list.sort(key=lambda x: x[0].full_path)
+        for routes_list in unused_by_method.values():
+            routes_list.sort(key=lambda route: route.full_path)
 
         # Generate report for routes WITH usage
-        self._generate_used_routes_report(routes_with_usage_list, matched)
+        self._generate_used_routes_report(used_by_method)
 
         # Generate report for routes WITHOUT usage
-        self._generate_unused_routes_report(routes_without_usage_list)
+        self._generate_unused_routes_report(unused_by_method)
 
         # Print summary
         print(f"\n✅ Reports generated:")
         print(f"   📄 flask_routes_with_usage.md")
-        print(f"      - {len(routes_with_usage_list)} routes with usage")
+        print(f"      - {sum(map(len, used_by_method.values()))} routes with usage")
         print(
-            f"      - {sum(len(usages) for _, usages in routes_with_usage_list)} total frontend calls"
+            f"      - {self._count_usages(used_by_method)} total frontend calls"
         )
         print(f"\n   📄 flask_routes_without_usage.md")
-        print(f"      - {len(routes_without_usage_list)} routes without usage")
+        print(f"      - {sum(map(len, unused_by_method.values()))} routes without usage")
+
+    @staticmethod
+    def _count_usages(used_by_method: Dict[str, List[Tuple[RouteInfo, List[UsageInfo]]]]) -> int:
+        """Count frontend calls across all routes with usage"""
+        return sum(
+            len(usages) for routes_list in used_by_method.values() for _, usages in routes_list
+        )
 
     def _generate_used_routes_report(
-        self,
-        routes_with_usage: List[tuple],
-        all_matched: Dict,
+        self, by_method: Dict[str, List[Tuple[RouteInfo, List[UsageInfo]]]]
     ) -> None:
-        """Generate report for routes that have frontend usage"""
+        """Generate report for routes that have frontend usage, grouped by method and sorted by path"""
         output_file = "flask_routes_with_usage.md"
 
-        # Sort routes by method and path
-        sorted_routes = sorted(
-            routes_with_usage, key=lambda x: (x[0].method, x[0].full_path)
-        )
+        # Build the whole report in memory and write it once
+        parts: List[str] = []
+        write = parts.append
+
+        write("# Flask Routes WITH Frontend Usage\n\n")
+        write(f"**Total Routes with Usage:** {sum(map(len, by_method.values()))}\n\n")
+        write(f"**Total Frontend Calls:** {self._count_usages(by_method)}\n\n")
+        write("---\n\n")
+
+        # Table of contents
+        write("## Table of Contents\n\n")
+        for method in sorted(by_method.keys()):
+            count = len(by_method[method])
+            write(f"- [{method} Routes ({count})](#-{method.lower()}-routes-)\n")
+        write("\n---\n\n")
+
+        # Routes by method
+        for method in sorted(by_method.keys()):
+            write(f"## {method} Routes\n\n")
+
+            routes_list = by_method[method]
+            for route, usages in routes_list:
+                write(f"### {method} `{route.full_path}`\n\n")
+                write(
+                    f"**Backend Location:** `{route.file_path}:{route.line_number}`\n\n"
+                )
+                write(f"**Function:** `{route.function_name}()`\n\n")
+                write(
+                    f"**Frontend Usage:** ({len(usages)} location{'s' if len(usages) != 1 else ''})\n\n"
+                )
+
+                for usage in usages:
+                    write(f"- `{usage.file_path}:{usage.line_number}`\n")
+                    # Show a snippet of the line
+                    snippet = usage.line_content[:100]
+                    if len(usage.line_content) > 100:
+                        snippet += "..."
+                    write(f"  ```typescript\n  {snippet}\n  ```\n")
+
+                write("\n---\n\n")
+
+        write("*Report generated by pamfilico-python-utils flask_route_usage_report*\n")
 
         with open(output_file, "w", encoding="utf-8") as f:
-            f.write("# Flask Routes WITH Frontend Usage\n\n")
-            f.write(f"**Total Routes with Usage:** {len(routes_with_usage)}\n\n")
-            f.write(
-                f"**Total Frontend Calls:** {sum(len(usages) for _, usages in routes_with_usage)}\n\n"
-            )
-            f.write("---\n\n")
-
-            # Group by method for easier navigation
-            by_method = defaultdict(list)
-            for route, usages in sorted_routes:
-                by_method[route.method].append((route, usages))
-
-            # Table of contents
-            f.write("## Table of Contents\n\n")
-            for method in sorted(by_method.keys()):
-                count = len(by_method[method])
-                f.write(f"- [{method} Routes ({count})](#-{method.lower()}-routes-)\n")
-            f.write("\n---\n\n")
-
-            # Routes by method
-            for method in sorted(by_method.keys()):
-                f.write(f"## {method} Routes\n\n")
-
-                routes_list = by_method[method]
-                for route, usages in routes_list:
-                    f.write(f"### {method} `{route.full_path}`\n\n")
-                    f.write(
-                        f"**Backend Location:** `{route.file_path}:{route.line_number}`\n\n"
-                    )
-                    f.write(f"**Function:** `{route.function_name}()`\n\n")
-                    f.write(
-                        f"**Frontend Usage:** ({len(usages)} location{'s' if len(usages) != 1 else ''})\n\n"
-                    )
-
-                    for usage in usages:
-                        f.write(f"- `{usage.file_path}:{usage.line_number}`\n")
-                        # Show a snippet of the line
-                        snippet = usage.line_content[:100]
-                        if len(usage.line_content) > 100:
-                            snippet += "..."
-                        f.write(f"  ```typescript\n  {snippet}\n  ```\n")
-
-                    f.write("\n---\n\n")
-
-            f.write("*Report generated by pamfilico-python-utils flask_route_usage_report*\n")
-
-    def _generate_unused_routes_report(
-        self, routes_without_usage: List[tuple]
-    ) -> None:
-        """Generate report for routes that have no frontend usage"""
+            f.write("".join(parts))
+
+    def _generate_unused_routes_report(self, by_method: Dict[str, List[RouteInfo]]) -> None:
+        """Generate report for routes that have no frontend usage, grouped by method and sorted by path"""
         output_file = "flask_routes_without_usage.md"
 
-        # Sort routes by method and path
-        sorted_routes = sorted(
-            routes_without_usage, key=lambda x: (x[0].method, x[0].full_path)
-        )
+        # Build the whole report in memory and write it once
+        parts: List[str] = []
+        write = parts.append
+
+        write("# Flask Routes WITHOUT Frontend Usage\n\n")
+        write(f"**Total Unused Routes:** {sum(map(len, by_method.values()))}\n\n")
+        write("Routes that have no detected frontend usage. These may be:\n")
+        write("- Dead code that can be removed\n")
+        write("- Internal/admin endpoints not used in these frontends\n")
+        write("- Routes used by external clients (mobile apps, integrations)\n")
+        write("- Future/upcoming features not yet implemented\n\n")
+        write("---\n\n")
+
+        # Table of contents
+        write("## Table of Contents\n\n")
+        for method in sorted(by_method.keys()):
+            count = len(by_method[method])
+            write(f"- [{method} Routes ({count})](#-{method.lower()}-routes-)\n")
+        write("\n---\n\n")
+
+        # Routes by method
+        for method in sorted(by_method.keys()):
+            write(f"## {method} Routes\n\n")
+
+            routes_list = by_method[method]
+            for route in routes_list:
+                write(f"### {method} `{route.full_path}`\n\n")
+                write(
+                    f"**Backend Location:** `{route.file_path}:{route.line_number}`\n\n"
+                )
+                write(f"**Function:** `{route.function_name}()`\n\n")
+                write("---\n\n")
+
+        write("*Report generated by pamfilico-python-utils flask_route_usage_report*\n")
 
         with open(output_file, "w", encoding="utf-8") as f:
-            f.write("# Flask Routes WITHOUT Frontend Usage\n\n")
-            f.write(f"**Total Unused Routes:** {len(routes_without_usage)}\n\n")
-            f.write("Routes that have no detected frontend usage. These may be:\n")
-            f.write("- Dead code that can be removed\n")
-            f.write("- Internal/admin endpoints not used in these frontends\n")
-            f.write("- Routes used by external clients (mobile apps, integrations)\n")
-            f.write("- Future/upcoming features not yet implemented\n\n")
-            f.write("---\n\n")
-
-            # Group by method
-            by_method = defaultdict(list)
-            for route, _ in sorted_routes:
-                by_method[route.method].append(route)
-
-            # Table of contents
-            f.write("## Table of Contents\n\n")
-            for method in sorted(by_method.keys()):
-                count = len(by_method[method])
-                f.write(f"- [{method} Routes ({count})](#-{method.lower()}-routes-)\n")
-            f.write("\n---\n\n")
-
-            # Routes by method
-            for method in sorted(by_method.keys()):
-                f.write(f"## {method} Routes\n\n")
-
-                routes_list = by_method[method]
-                for route in routes_list:
-                    f.write(f"### {method} `{route.full_path}`\n\n")
-                    f.write(
-                        f"**Backend Location:** `{route.file_path}:{route.line_number}`\n\n"
-                    )
-                    f.write(f"**Function:** `{route.function_name}()`\n\n")
-                    f.write("---\n\n")
-
-            f.write("*Report generated by pamfilico-python-utils flask_route_usage_report*\n")
+            f.write("".join(parts))
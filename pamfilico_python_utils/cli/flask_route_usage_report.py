@@ -9,16 +9,20 @@ import sys
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-try:
-    import tomli
-except ImportError:
-    try:
-        import tomllib as tomli  # Python 3.11+
-    except ImportError:
-        tomli = None
-
+from pamfilico_python_utils.cli._config import find_tool_config
 from pamfilico_python_utils.cli.flask_route_analyzer import FlaskRouteAnalyzer
 
+# Defaults for settings not given in [tool.flask_route_usage]
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "backend": "./",
+    "api_path": "app",
+    "frontends": [],
+    "frontend_src": "src",
+}
+
+SEPARATOR = "=" * 50
+BANNER = "Flask Route Usage Analyzer\n" + SEPARATOR
+
 
 def load_config_from_pyproject() -> Optional[Dict[str, Any]]:
     """Load configuration from pyproject.toml if it exists
@@ -26,26 +30,13 @@ def load_config_from_pyproject() -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary with config or None if not found
     """
-    if tomli is None:
+    found = find_tool_config("flask_route_usage")
+    if found is None:
         return None
 
-    # Look for pyproject.toml in current directory or parent directories
-    cwd = Path.cwd()
-    for path in [cwd] + list(cwd.parents):
-        pyproject_path = path / "pyproject.toml"
-        if pyproject_path.exists():
-            try:
-                with open(pyproject_path, "rb") as f:
-                    data = tomli.load(f)
-                    config = data.get("tool", {}).get("flask_route_usage", {})
-                    if config:
-                        print(f"📋 Loaded config from: {pyproject_path}")
-                        return config
-            except Exception as e:
-                print(f"Warning: Could not load {pyproject_path}: {e}")
-                continue
-
-    return None
+    pyproject_path, _, config = found
+    print(f"📋 Loaded config from: {pyproject_path}")
+    return config
 
 
 def parse_arguments():
@@ -53,14 +44,12 @@ def parse_arguments():
 
     Command-line arguments override pyproject.toml settings.
     """
-    # Load config from pyproject.toml
-    config = load_config_from_pyproject()
-
     # Set defaults from config or sensible defaults
-    default_backend = config.get("backend", "./") if config else "./"
-    default_api_path = config.get("api_path", "app") if config else "app"
-    default_frontends = config.get("frontends", []) if config else []
-    default_frontend_src = config.get("frontend_src", "src") if config else "src"
+    defaults = {**DEFAULT_CONFIG, **(load_config_from_pyproject() or {})}
+    default_backend = defaults["backend"]
+    default_api_path = defaults["api_path"]
+    default_frontends = defaults["frontends"]
+    default_frontend_src = defaults["frontend_src"]
 
     parser = argparse.ArgumentParser(
         description="Analyze Flask routes and their frontend usage",
@@ -147,15 +136,13 @@ def main():
     backend_root = cwd / args.backend
     frontend_roots = [cwd / f for f in args.frontends]
 
-    print("Flask Route Usage Analyzer")
-    print("=" * 50)
+    print(BANNER)
     print(f"Backend: {backend_root}")
     print(f"API Path: {backend_root / args.api_path}")
     for frontend in frontend_roots:
         print(f"Frontend: {frontend}")
         print(f"  Source: {frontend / args.frontend_src}")
-    print("=" * 50)
-    print()
+    print(SEPARATOR + "\n")
 
     # Verify paths exist
     if not backend_root.exists():
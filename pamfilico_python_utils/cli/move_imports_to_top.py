@@ -6,26 +6,136 @@ to the top of Python files. This is particularly useful for Flask route files
 that have imports scattered throughout the functions.
 """
 
-import argparse
+import ast
+import io
+import mmap
+import os
 import re
+import stat
 import sys
+import tempfile
+import tokenize
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, repeat
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Any
-from collections import defaultdict
+from typing import Dict, List, Optional, Any
 
-try:
-    import tomli
-except ImportError:
-    try:
-        import tomllib as tomli  # Python 3.11+
-    except ImportError:
-        tomli = None
+from pamfilico_python_utils.cli._config import find_tool_config
+from pamfilico_python_utils.cli._files import DEFAULT_PATTERN, SKIP_DIRS, find_python_files
+
+
+# Nodes whose own bodies hold the inline imports that are moved; imports in
+# class bodies bind class attributes, and imports under try/if/with/loops
+# are conditional, so those stay where they are
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Fields holding statement lists, plus the except handlers and match cases that
+# wrap them, followed to reach nested functions
+_BLOCK_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
+
+# Cheap pre-check on raw bytes: every inline import starts an indented line
+_INDENTED_IMPORT_PATTERN = re.compile(rb'^[ \t]+(?:import|from)\b', re.MULTILINE)
 
+# Line-based fallback check: indented by 4 spaces or a tab, then import/from
+_INLINE_IMPORT_LINE_PATTERN = re.compile(r'(?:    |\t)\s*(?:import|from) ')
+
+# Tokens that never start or end a statement of the module header
+_NON_CODE_TOKENS = frozenset({tokenize.ENCODING, tokenize.COMMENT, tokenize.NL})
 
 
 def extract_inline_imports(file_content: str) -> tuple[List[str], str]:
     """
     Extract all inline imports from file content and return them along with cleaned content.
+    Only extracts import statements that sit directly in a function body and start their
+    own line, found with a single ast.parse so imports mentioned in strings are left alone.
+    Imports nested in try/except, if, with or loop blocks are left in place, and so are
+    a function's imports when moving them would leave its body empty.
+    Files that don't parse fall back to the line-based scanner.
+    
+    Args:
+        file_content: The content of the Python file
+        
+    Returns:
+        Tuple of (list_of_imports, content_without_inline_imports)
+    """
+    try:
+        tree = ast.parse(file_content)
+    except (SyntaxError, ValueError):
+        return _extract_inline_imports_by_lines(file_content)
+
+    lines = file_content.split('\n')
+    import_ranges = set()  # (first_line, last_line) of each inline import, 1-based
+
+    # Single traversal over statement blocks; imports are statements, so
+    # expressions are never visited
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _SCOPE_NODES):
+            ranges = _import_statement_ranges(node.body, lines)
+            # The body needs a statement left over once its imports are gone
+            if ranges and len(node.body) > sum(
+                1 for statement in node.body
+                if any(first <= statement.lineno <= last for first, last in ranges)
+            ):
+                import_ranges.update(ranges)
+        for field in _BLOCK_FIELDS:
+            statements = getattr(node, field, None)
+            if isinstance(statements, list):
+                stack.extend(statements)
+
+    imports = {}  # Insertion-ordered set of the imports found
+    skip_ranges = []  # [start, end) line indices to drop, in file order
+    for first_line, last_line in sorted(import_ranges):
+        # Empty lines inside a multi-line import are removed but not kept
+        import_lines = [line.strip() for line in lines[first_line - 1:last_line] if line.strip()]
+        skip_ranges.append((first_line - 1, last_line))
+
+        imports['\n'.join(import_lines)] = None
+
+    return list(imports), _join_without_ranges(lines, skip_ranges)
+
+
+def _join_without_ranges(lines: List[str], skip_ranges: List[tuple]) -> str:
+    """Join lines back together, copying the slices between the sorted [start, end) ranges"""
+    cleaned_lines = []
+    prev = 0
+    for start, end in skip_ranges:
+        cleaned_lines.extend(lines[prev:start])
+        prev = end
+    cleaned_lines.extend(lines[prev:])
+    return '\n'.join(cleaned_lines)
+
+
+def _import_statement_ranges(statements: List[ast.stmt], lines: List[str]) -> List[tuple]:
+    """
+    Find the line ranges of import statements in a block that can be moved as whole lines.
+
+    Statements sharing a line (``import a; import b``) are grouped; a group only counts
+    when it is made of imports alone and starts its line.
+    """
+    groups = []
+    for statement in statements:
+        if groups and statement.lineno <= groups[-1][-1].end_lineno:
+            groups[-1].append(statement)
+        else:
+            groups.append([statement])
+
+    ranges = []
+    for group in groups:
+        if not all(isinstance(statement, (ast.Import, ast.ImportFrom)) for statement in group):
+            continue
+        line = lines[group[0].lineno - 1]
+        if len(line) - len(line.lstrip()) != group[0].col_offset:
+            continue  # Shares its line with a compound statement header (``if x: import y``)
+        ranges.append((group[0].lineno, group[-1].end_lineno))
+    return ranges
+
+
+def _extract_inline_imports_by_lines(file_content: str) -> tuple[List[str], str]:
+    """
+    Line-based fallback for extract_inline_imports, for files ast can't parse.
     Only extracts imports that are actually indented AND start with import/from keywords.
     
     Args:
@@ -35,70 +145,51 @@ def extract_inline_imports(file_content: str) -> tuple[List[str], str]:
         Tuple of (list_of_imports, content_without_inline_imports)
     """
     lines = file_content.split('\n')
-    imports = []
-    lines_to_remove = []  # Track exact line indices to remove
+    imports = {}  # Insertion-ordered set of the imports found
+    skip_ranges = []  # [start, end) line indices to remove, in file order
+    line_starts = None  # Offset of each line in file_content, built on first use
     
     i = 0
     while i < len(lines):
-        line = lines[i]
-        stripped = line.strip()
-        
         # Only detect lines that:
         # 1. Are indented (inside functions/classes)
         # 2. Actually start with import/from keywords
         # 3. Are not just identifiers in a multi-line import
-        if ((line.startswith('    ') or line.startswith('\t')) and 
-            stripped and
-            (stripped.startswith('import ') or stripped.startswith('from '))):
+        if _INLINE_IMPORT_LINE_PATTERN.match(lines[i]):
             
             # This is a potential inline import
+            stripped = lines[i].strip()
             import_start_idx = i
             import_lines = [stripped]
-            lines_to_remove.append(i)
             
             # Check if this is a multi-line import
             if '(' in stripped and ')' not in stripped:
-                # Multi-line import - read continuation lines
-                j = i + 1
-                while j < len(lines) and j - i < 20:  # Safety limit
-                    next_line = lines[j]
+                # Multi-line import - the first ')' after this line closes it,
+                # found with one scan of the content instead of a per-line loop
+                if line_starts is None:
+                    line_starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
+                close_pos = file_content.find(')', line_starts[i + 1])
+                close_idx = bisect_right(line_starts, close_pos) - 1 if close_pos >= 0 else len(lines) - 1
+                j = min(close_idx + 1, i + 20)  # Safety limit
+                
+                # Empty lines are removed but not included in the import
+                for next_line in lines[i + 1:j]:
                     next_stripped = next_line.strip()
-                    
-                    if not next_stripped:
-                        # Empty line - skip but don't include in import
-                        lines_to_remove.append(j)
-                        j += 1
-                        continue
-                    
-                    # Add this line to the import and mark for removal
-                    import_lines.append(next_stripped)
-                    lines_to_remove.append(j)
-                    
-                    # Check if this line closes the import
-                    if ')' in next_stripped:
-                        j += 1
-                        break
-                        
-                    j += 1
+                    if next_stripped:
+                        import_lines.append(next_stripped)
                 
                 i = j  # Continue from after the multi-line import
             else:
                 i += 1  # Single-line import
+            skip_ranges.append((import_start_idx, i))
             
             # Add the complete import
-            complete_import = '\n'.join(import_lines)
-            if complete_import not in imports:
-                imports.append(complete_import)
+            imports['\n'.join(import_lines)] = None
         else:
             i += 1
     
     # Build cleaned content by removing the marked lines
-    cleaned_lines = []
-    for idx, line in enumerate(lines):
-        if idx not in lines_to_remove:
-            cleaned_lines.append(line)
-    
-    return imports, '\n'.join(cleaned_lines)
+    return list(imports), _join_without_ranges(lines, skip_ranges)
 
 
 def insert_imports_at_top(file_content: str, new_imports: List[str]) -> str:
@@ -115,68 +206,55 @@ def insert_imports_at_top(file_content: str, new_imports: List[str]) -> str:
     if not new_imports:
         return file_content
         
-    lines = file_content.split('\n')
+    # Insert after the last top-level import, or at the beginning if there are none
+    insertion_point = _top_level_imports_end(file_content)
+    block = '\n'.join(new_imports)
     
-    # Find the insertion point (after existing imports)
-    insertion_point = 0
-    last_import_line = -1
-    
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        
-        # Skip empty lines and comments at the beginning
-        if not stripped or stripped.startswith('#'):
-            continue
-            
-        # Check if this is an import line (at top level - no indentation)
-        if (not line.startswith(' ') and not line.startswith('\t') and 
-            (stripped.startswith('import ') or stripped.startswith('from '))):
-            
-            # Handle multi-line imports - find the end
-            if '(' in stripped and ')' not in stripped:
-                # Multi-line import - scan forward to find the closing parenthesis
-                j = i + 1
-                while j < len(lines):
-                    if ')' in lines[j]:
-                        last_import_line = j  # End of the multi-line import
-                        break
-                    j += 1
-            else:
-                # Single-line import
-                last_import_line = i
-            continue
-            
-        # Check for docstrings (triple quotes)
-        if stripped.startswith('"""') or stripped.startswith("'''"):
-            # Skip docstring
-            quote_type = stripped[:3]
-            if stripped.count(quote_type) >= 2:
-                # Single line docstring
+    # Only the header's newlines are looked up; the rest of the file is copied as is
+    offset = 0
+    for _ in range(insertion_point):
+        offset = file_content.find('\n', offset) + 1
+        if not offset:
+            # The last import ends the file without a trailing newline
+            return file_content + '\n' + block
+    return file_content[:offset] + block + '\n' + file_content[offset:]
+
+
+def _top_level_imports_end(file_content: str) -> int:
+    """
+    Find the line count up to and including the last import of the module header.
+
+    The header is the leading run of top-level import statements and string
+    statements (docstrings), with comments and blank lines in between. Tokens are
+    read lazily, so only the header itself needs to tokenize.
+    """
+    last_import_end = 0
+    statement_start = True
+    is_import = False
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(file_content).readline):
+            if tok.type in _NON_CODE_TOKENS:
                 continue
-            else:
-                # Multi-line docstring - find end
-                for j in range(i + 1, len(lines)):
-                    if quote_type in lines[j]:
-                        i = j
-                        break
+            if tok.type == tokenize.NEWLINE:
+                if is_import:
+                    last_import_end = tok.start[0]
+                statement_start = True
                 continue
-        
-        # If we hit non-import, non-comment, non-docstring code, stop
-        if stripped and not stripped.startswith('#'):
-            break
-    
-    # Insert point is after last import line, or at beginning if no imports
-    insertion_point = last_import_line + 1 if last_import_line >= 0 else 0
-    
-    # Insert new imports
-    for import_stmt in new_imports:
-        lines.insert(insertion_point, import_stmt)
-        insertion_point += 1
-    
-    return '\n'.join(lines)
+            if not statement_start:
+                continue
+            statement_start = False
+            if tok.type == tokenize.NAME and tok.string in ('import', 'from'):
+                is_import = True
+            elif tok.type == tokenize.STRING:
+                is_import = False
+            else:
+                break  # First statement that isn't an import or a docstring
+    except (tokenize.TokenError, SyntaxError):
+        pass  # Keep what was found before the header stopped tokenizing
+    return last_import_end
 
 
-def process_file(file_path: Path, dry_run: bool = True) -> tuple[bool, int]:
+def process_file(file_path: str, dry_run: bool = True) -> tuple[bool, int, List[str]]:
     """
     Process a single Python file to move imports to top.
     
@@ -185,77 +263,108 @@ def process_file(file_path: Path, dry_run: bool = True) -> tuple[bool, int]:
         dry_run: If True, don't actually modify files
         
     Returns:
-        Tuple of (was_modified, number_of_imports_moved)
+        Tuple of (was_modified, number_of_imports_moved, status_messages).
+        Messages are returned rather than printed so files can be processed in parallel.
     """
+    messages = []
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            original_content = f.read()
+        # Most files have no indented import at all; scan a read-only mapping
+        # and skip them before anything is copied or decoded
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False, 0, messages  # Empty files can't be mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if _INDENTED_IMPORT_PATTERN.search(mm) is None:
+                    return False, 0, messages
+                data = mm[:]
+        
+        original_content = data.decode('utf-8')
+        if '\r' in original_content:
+            # Same universal newline handling as text mode
+            original_content = original_content.replace('\r\n', '\n').replace('\r', '\n')
         
         # Extract inline imports
         inline_imports, cleaned_content = extract_inline_imports(original_content)
         
         
         if not inline_imports:
-            return False, 0
+            return False, 0, messages
         
         # Insert imports at top
         final_content = insert_imports_at_top(cleaned_content, inline_imports)
         
         if dry_run:
-            print(f"  🔍 DRY RUN: Would move {len(inline_imports)} imports")
+            messages.append(f"  🔍 DRY RUN: Would move {len(inline_imports)} imports")
             for imp in inline_imports[:5]:  # Show first 5
-                print(f"    - {imp}")
+                messages.append(f"    - {imp}")
             if len(inline_imports) > 5:
-                print(f"    ... and {len(inline_imports) - 5} more")
+                messages.append(f"    ... and {len(inline_imports) - 5} more")
         else:
             # Write the modified content back
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(final_content)
-            print(f"  ✅ Moved {len(inline_imports)} imports to top")
+            _write_atomic(file_path, final_content.encode('utf-8'))
+            messages.append(f"  ✅ Moved {len(inline_imports)} imports to top")
         
-        return True, len(inline_imports)
+        return True, len(inline_imports), messages
         
     except Exception as e:
-        print(f"  ❌ Error processing {file_path}: {e}")
-        return False, 0
+        messages.append(f"  ❌ Error processing {file_path}: {e}")
+        return False, 0, messages
+
+
+def _write_atomic(file_path: str, data: bytes) -> None:
+    """
+    Replace file_path with data, so a crash never leaves a truncated file behind.
+    Symlinks are resolved first, so the link stays and its target is rewritten.
+    The new content goes to a uniquely named temporary file in the target's
+    directory that is fsynced and then swapped in with os.replace, keeping the
+    original file's permission bits (and its owner, where allowed).
+    """
+    real_path = os.path.realpath(file_path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(real_path), prefix=f".{os.path.basename(real_path)}.", suffix='.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        st = os.stat(real_path)
+        os.chmod(tmp_path, stat.S_IMODE(st.st_mode))
+        if hasattr(os, 'chown'):
+            try:
+                os.chown(tmp_path, st.st_uid, st.st_gid)
+            except OSError:
+                pass  # Only the owner's permission bits can be kept
+        os.replace(tmp_path, real_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def load_config_from_pyproject() -> Optional[Dict[str, Any]]:
     """Load configuration from pyproject.toml if it exists"""
-    if tomli is None:
+    # Try specific config first, then fall back to flask_route_usage config for backend path
+    found = find_tool_config("move_imports_to_top", "flask_route_usage")
+    if found is None:
         return None
 
-    # Look for pyproject.toml in current directory or parent directories
-    cwd = Path.cwd()
-    for path in [cwd] + list(cwd.parents):
-        pyproject_path = path / "pyproject.toml"
-        if pyproject_path.exists():
-            try:
-                with open(pyproject_path, "rb") as f:
-                    data = tomli.load(f)
-                    # Try specific config first
-                    config = data.get("tool", {}).get("move_imports_to_top", {})
-                    if config:
-                        print(f"📋 Loaded config from: {pyproject_path}")
-                        return config
-                    
-                    # Fall back to flask_route_usage config for backend path
-                    flask_config = data.get("tool", {}).get("flask_route_usage", {})
-                    if flask_config:
-                        mapped_config = {
-                            "backend_path": flask_config.get("backend", "./"),
-                        }
-                        print(f"📋 Loaded config from: {pyproject_path} (flask_route_usage)")
-                        return mapped_config
-            except Exception as e:
-                print(f"Warning: Could not load {pyproject_path}: {e}")
-                continue
+    pyproject_path, section, config = found
+    if section == "move_imports_to_top":
+        print(f"📋 Loaded config from: {pyproject_path}")
+        return config
 
-    return None
+    mapped_config = {
+        "backend_path": config.get("backend", "./"),
+    }
+    print(f"📋 Loaded config from: {pyproject_path} (flask_route_usage)")
+    return mapped_config
 
 
 def parse_arguments():
     """Parse command line arguments with pyproject.toml config support"""
+    import argparse
+
     # Load config from pyproject.toml
     config = load_config_from_pyproject()
 
@@ -300,8 +409,15 @@ Configuration:
     parser.add_argument(
         '--pattern',
         type=str,
-        default='**/*.py',
-        help='File pattern to match (default: **/*.py)'
+        default=DEFAULT_PATTERN,
+        help=f'File pattern to match (default: {DEFAULT_PATTERN})'
+    )
+
+    parser.add_argument(
+        '--exclude',
+        nargs='*',
+        default=[],
+        help=f'Extra directory names to skip, on top of: {", ".join(sorted(SKIP_DIRS))}'
     )
 
     return parser.parse_args()
@@ -329,11 +445,11 @@ def main():
 
     # Find all Python files using the pattern relative to backend_base
     try:
-        python_files = list(backend_base.glob(args.pattern))
+        python_files = find_python_files(backend_base, args.pattern, SKIP_DIRS.union(args.exclude))
         print(f"🔍 Found {len(python_files)} files matching pattern")
         
         # Debug: show first few matches
-        for i, f in enumerate(python_files[:3]):
+        for i, f in enumerate(map(Path, python_files[:3])):
             print(f"  🎯 Match {i+1}: {f.relative_to(cwd) if f.is_relative_to(cwd) else f}")
         if len(python_files) > 3:
             print(f"  ... and {len(python_files) - 3} more")
@@ -363,11 +479,20 @@ def main():
     total_files_modified = 0
     total_imports_moved = 0
 
-    for py_file in python_files:
-        relative_path = py_file.relative_to(backend_base)
+    # Files are independent, so process them in parallel when there is more than one
+    if len(python_files) > 1:
+        with ProcessPoolExecutor() as executor:
+            results = list(
+                executor.map(process_file, python_files, repeat(args.dry_run), chunksize=32)
+            )
+    else:
+        results = [process_file(py_file, args.dry_run) for py_file in python_files]
+
+    for py_file, (was_modified, imports_count, messages) in zip(python_files, results):
+        relative_path = os.path.relpath(py_file, backend_base)
         print(f"📝 Processing: {relative_path}")
-        
-        was_modified, imports_count = process_file(py_file, args.dry_run)
+        for message in messages:
+            print(message)
         
         if was_modified:
             total_files_modified += 1
@@ -19,26 +19,47 @@ Usage:
     poetry run python_quality_audit --pattern "src/**/*.py" --dry-run
 """
 
-import subprocess
 import sys
 import os
 import re
+import shutil
 from pathlib import Path
-from datetime import datetime
-import argparse
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import lru_cache
+import io
 from typing import Optional, Dict, Any
 
-try:
-    import tomli
-except ImportError:
-    try:
-        import tomllib as tomli  # Python 3.11+
-    except ImportError:
-        tomli = None
+from pamfilico_python_utils.cli._config import find_tool_config
+from pamfilico_python_utils.cli._files import SKIP_DIRS, find_python_files
+
+# Flask route decorators patterns
+FLASK_ROUTE_DECORATORS = (
+    '@api.route', '@app.route', '@blueprint.route', '@bp.route',
+    '@api_bp.route', '@main.route', '@views.route'
+)
+
+# All decorators in one alternation, so each block is scanned once
+FLASK_ROUTE_DECORATOR_PATTERN = re.compile('|'.join(map(re.escape, FLASK_ROUTE_DECORATORS)))
+
+# Vulture's unused function lines, parsed in one match
+VULTURE_UNUSED_FUNCTION_PATTERN = re.compile(
+    r"(?P<path>[^:]*):(?P<line>\d+):.*?unused function '(?P<name>[^']+)'"
+)
+
+# Files per radon invocation when analyzing many files at once
+RADON_BATCH_SIZE = 200
+
+# Directories left out of pattern mode
+AUDIT_SKIP_DIRS = SKIP_DIRS | {"audit"}
+
+# Tool subprocesses running at the same time, across all audited files
+TOOL_WORKERS = os.cpu_count() or 1
 
 
 def run_command(cmd: list[str], timeout: int = 120) -> tuple[str, str, int]:
     """Run a command and return stdout, stderr, returncode."""
+    import subprocess
+
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
         return result.stdout, result.stderr, result.returncode
@@ -76,6 +97,51 @@ def analyze_radon_hal(target: str) -> str:
     return stdout if stdout.strip() else "No functions analyzed.\n"
 
 
+def split_output_by_target(output: str, targets: list[str]) -> Dict[str, str]:
+    """Split multi-file tool output into per-file sections.
+
+    Each section starts with a line at column 0 naming the file, as radon
+    prints it ("path", "path:" or "path - grade").
+    """
+    wanted = set(targets)
+    sections: Dict[str, list[str]] = {}
+    current = None
+    for line in output.splitlines():
+        if line and not line[0].isspace():
+            for head in (line, line[:-1], line.rsplit(" - ", 1)[0]):
+                if head in wanted:
+                    current = sections.setdefault(head, [])
+                    break
+        if current is not None:
+            current.append(line)
+    return {target: "\n".join(lines) + "\n" for target, lines in sections.items()}
+
+
+def analyze_radon_batch(targets: list[str]) -> Dict[str, Dict[str, str]]:
+    """Run the radon metrics that report each file separately once for all targets.
+
+    Returns:
+        Mapping of target -> {job name: output}. Targets missing from the
+        mapping (or a tool that failed to run) are analyzed per file instead.
+    """
+    commands = {
+        "mi": ["radon", "mi", "-s"],
+        "hal": ["radon", "hal"],
+    }
+    targets = list(dict.fromkeys(targets))
+    results: Dict[str, Dict[str, str]] = {}
+    # Chunked to stay well inside the command line length limit
+    for start in range(0, len(targets), RADON_BATCH_SIZE):
+        chunk = targets[start:start + RADON_BATCH_SIZE]
+        for name, cmd in commands.items():
+            stdout, _, rc = run_command(cmd + chunk)
+            if rc == -1:
+                continue
+            for target, output in split_output_by_target(stdout, chunk).items():
+                results.setdefault(target, {})[name] = output
+    return results
+
+
 def analyze_xenon(target: str, threshold: str = "B") -> str:
     """Xenon threshold check."""
     stdout, stderr, rc = run_command([
@@ -137,11 +203,17 @@ def analyze_pylint(target: str) -> str:
     return stdout if stdout.strip() else "No issues found.\n"
 
 
+@lru_cache(maxsize=256)
+def _read_lines(file_path: str, mtime_ns: int) -> tuple[str, ...]:
+    """Read a file's lines once per modification, for the many vulture hits in one file"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return tuple(f.readlines())
+
+
 def is_flask_route_function(file_path: str, function_name: str, line_number: int) -> bool:
     """Check if a function is a Flask route by examining decorators above it."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        lines = _read_lines(file_path, os.stat(file_path).st_mtime_ns)
         
         # Look backwards from the function line for decorators
         start_idx = max(0, line_number - 10)  # Check up to 10 lines before
@@ -149,14 +221,8 @@ def is_flask_route_function(file_path: str, function_name: str, line_number: int
         
         function_block = ''.join(lines[start_idx:end_idx])
         
-        # Flask route decorators patterns
-        flask_decorators = [
-            '@api.route', '@app.route', '@blueprint.route', '@bp.route',
-            '@api_bp.route', '@main.route', '@views.route'
-        ]
-        
         # Check if any Flask decorator appears before the function
-        return any(decorator in function_block for decorator in flask_decorators)
+        return FLASK_ROUTE_DECORATOR_PATTERN.search(function_block) is not None
         
     except Exception:
         return False
@@ -177,25 +243,16 @@ def analyze_vulture(target: str) -> str:
     flask_routes_ignored = []
     
     for line in lines:
-        if 'unused function' in line:
-            # Parse vulture output: "path:line: unused function 'name' (confidence%)"
-            try:
-                parts = line.split(':')
-                if len(parts) >= 3:
-                    file_path = parts[0]
-                    line_number = int(parts[1]) - 1  # Convert to 0-based index
-                    
-                    # Extract function name from the message
-                    match = re.search(r"unused function '([^']+)'", line)
-                    if match:
-                        function_name = match.group(1)
-                        
-                        # Check if this is a Flask route function
-                        if is_flask_route_function(file_path, function_name, line_number):
-                            flask_routes_ignored.append(function_name)
-                            continue  # Skip this line (don't add to filtered_lines)
-            except (ValueError, IndexError):
-                pass  # If parsing fails, keep the original line
+        # Parse vulture output: "path:line: unused function 'name' (confidence%)"
+        match = VULTURE_UNUSED_FUNCTION_PATTERN.match(line)
+        if match:
+            function_name = match['name']
+            line_number = int(match['line']) - 1  # Convert to 0-based index
+            
+            # Check if this is a Flask route function
+            if is_flask_route_function(match['path'], function_name, line_number):
+                flask_routes_ignored.append(function_name)
+                continue  # Skip this line (don't add to filtered_lines)
         
         # Add non-Flask route lines to output
         filtered_lines.append(line)
@@ -220,96 +277,157 @@ def analyze_vulture(target: str) -> str:
     return '\n'.join(result)
 
 
-def generate_report(target: str, complexity_threshold: str = "C") -> str:
-    """Generate the full markdown report."""
+# Fixed text of each report section, in report order, followed by the tool
+# output in a code block
+REPORT_SECTIONS = (
+    ("cc", """
+## Cyclomatic Complexity (McCabe)
+
+Measures the number of independent paths through code.
+Grades: A (1-5), B (6-10), C (11-20), D (21-30), E (31-40), F (40+)
+
+```
+"""),
+    ("xenon", """
+## Complexity Threshold Check (Xenon)
+
+Threshold set to: **{complexity_threshold}** (fails if any function exceeds this grade)
+
+```
+"""),
+    ("mi", """
+## Maintainability Index (Oman-Hagemeister)
+
+Combines Halstead Volume, Cyclomatic Complexity, and LOC.
+Grades: A (20-100 high), B (10-19 medium), C (0-9 low)
+
+```
+"""),
+    ("hal", """
+## Halstead Metrics
+
+Measures: h1 (unique operators), h2 (unique operands), N1 (total operators), N2 (total operands)
+Derived: vocabulary, length, volume, difficulty, effort, time, bugs
+
+```
+"""),
+    ("cohesion", """
+## Class Cohesion (LCOM)
+
+Lack of Cohesion of Methods - measures how related methods are within a class.
+Lower percentage = better cohesion. High LCOM suggests class should be split.
+
+```
+"""),
+    ("bandit", """
+## Security Issues (Bandit)
+
+Scans for common security vulnerabilities and bad practices.
+
+```
+"""),
+    ("pylint", """
+## Code Quality (Pylint)
+
+Style, errors, refactoring suggestions, and overall score.
+
+```
+"""),
+    ("vulture", """
+## Dead Code (Vulture)
+
+Detects unused functions, variables, classes, and imports.
+Note: Flask route functions are automatically excluded from unused function reports.
+
+```
+"""),
+)
+
+REPORT_REFERENCES = """
+## References
+
+- McCabe (1976) 'A Complexity Measure' IEEE TSE
+- Halstead (1977) 'Elements of Software Science' Elsevier
+- Oman & Hagemeister (1992) 'Metrics for Assessing Maintainability' IEEE ICSM
+- Chidamber & Kemerer (1994) 'A Metrics Suite for OO Design' IEEE TSE (LCOM)
+"""
+
+
+def submit_report_jobs(
+    target: str,
+    complexity_threshold: str,
+    executor: Executor,
+    prefetched: Optional[Dict[str, str]] = None,
+) -> Dict[str, Future]:
+    """Submit the tool runs behind one report to executor.
+
+    Tool outputs already collected for this file (see analyze_radon_batch)
+    can be passed in prefetched, keyed by job name, and are not rerun.
+
+    Returns:
+        Futures of every report section's tool output, keyed by job name
+    """
+    target_str = str(Path(target).resolve())
+    jobs = {
+        "cc": (analyze_radon_cc, target_str),
+        "xenon": (analyze_xenon, target_str, complexity_threshold),
+        "mi": (analyze_radon_mi, target_str),
+        "hal": (analyze_radon_hal, target_str),
+        "cohesion": (analyze_cohesion, target_str),
+        "bandit": (analyze_bandit, target_str),
+        "pylint": (analyze_pylint, target_str),
+        "vulture": (analyze_vulture, target_str),
+    }
+    futures = {}
+    for name, (fn, *args) in jobs.items():
+        if prefetched and name in prefetched:
+            futures[name] = Future()
+            futures[name].set_result(prefetched[name])
+        else:
+            futures[name] = executor.submit(fn, *args)
+    return futures
+
+
+def render_report(target: str, complexity_threshold: str, results: Dict[str, str]) -> str:
+    """Render the markdown report from each section's tool output."""
+    from datetime import datetime
+
     target_path = Path(target).resolve()
+    generated = datetime.now()
+
+    buf = io.StringIO()
+    w = buf.write
+    w(
+        "# Python Code Quality Report\n\n"
+        f"**Target:** `{target_path}`\n"
+        f"**Generated:** {generated.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        "---\n"
+    )
     
-    report = []
-    report.append("# Python Code Quality Report")
-    report.append("")
-    report.append(f"**Target:** `{target_path}`")
-    report.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report.append("")
-    report.append("---")
-    
-    # Cyclomatic Complexity
-    report.append(section("Cyclomatic Complexity (McCabe)"))
-    report.append("Measures the number of independent paths through code.")
-    report.append("Grades: A (1-5), B (6-10), C (11-20), D (21-30), E (31-40), F (40+)")
-    report.append("")
-    report.append("```")
-    report.append(analyze_radon_cc(str(target_path)).rstrip())
-    report.append("```")
-    
-    # Xenon Threshold Check
-    report.append(section("Complexity Threshold Check (Xenon)"))
-    report.append(f"Threshold set to: **{complexity_threshold}** (fails if any function exceeds this grade)")
-    report.append("")
-    report.append("```")
-    report.append(analyze_xenon(str(target_path), complexity_threshold).rstrip())
-    report.append("```")
-    
-    # Maintainability Index
-    report.append(section("Maintainability Index (Oman-Hagemeister)"))
-    report.append("Combines Halstead Volume, Cyclomatic Complexity, and LOC.")
-    report.append("Grades: A (20-100 high), B (10-19 medium), C (0-9 low)")
-    report.append("")
-    report.append("```")
-    report.append(analyze_radon_mi(str(target_path)).rstrip())
-    report.append("```")
-    
-    # Halstead Metrics
-    report.append(section("Halstead Metrics"))
-    report.append("Measures: h1 (unique operators), h2 (unique operands), N1 (total operators), N2 (total operands)")
-    report.append("Derived: vocabulary, length, volume, difficulty, effort, time, bugs")
-    report.append("")
-    report.append("```")
-    report.append(analyze_radon_hal(str(target_path)).rstrip())
-    report.append("```")
-    
-    # Cohesion (LCOM)
-    report.append(section("Class Cohesion (LCOM)"))
-    report.append("Lack of Cohesion of Methods - measures how related methods are within a class.")
-    report.append("Lower percentage = better cohesion. High LCOM suggests class should be split.")
-    report.append("")
-    report.append("```")
-    report.append(analyze_cohesion(str(target_path)).rstrip())
-    report.append("```")
-    
-    # Security
-    report.append(section("Security Issues (Bandit)"))
-    report.append("Scans for common security vulnerabilities and bad practices.")
-    report.append("")
-    report.append("```")
-    report.append(analyze_bandit(str(target_path)).rstrip())
-    report.append("```")
-    
-    # Pylint
-    report.append(section("Code Quality (Pylint)"))
-    report.append("Style, errors, refactoring suggestions, and overall score.")
-    report.append("")
-    report.append("```")
-    report.append(analyze_pylint(str(target_path)).rstrip())
-    report.append("```")
-    
-    # Dead Code
-    report.append(section("Dead Code (Vulture)"))
-    report.append("Detects unused functions, variables, classes, and imports.")
-    report.append("Note: Flask route functions are automatically excluded from unused function reports.")
-    report.append("")
-    report.append("```")
-    report.append(analyze_vulture(str(target_path)).rstrip())
-    report.append("```")
-    
-    # References
-    report.append(section("References"))
-    report.append("- McCabe (1976) 'A Complexity Measure' IEEE TSE")
-    report.append("- Halstead (1977) 'Elements of Software Science' Elsevier")
-    report.append("- Oman & Hagemeister (1992) 'Metrics for Assessing Maintainability' IEEE ICSM")
-    report.append("- Chidamber & Kemerer (1994) 'A Metrics Suite for OO Design' IEEE TSE (LCOM)")
-    report.append("")
+    for name, intro in REPORT_SECTIONS:
+        w(intro.format(complexity_threshold=complexity_threshold))
+        w(results[name].rstrip())
+        w("\n```\n")
     
-    return "\n".join(report)
+    w(REPORT_REFERENCES)
+    return buf.getvalue()
+
+
+def generate_report(
+    target: str,
+    complexity_threshold: str = "C",
+    prefetched: Optional[Dict[str, str]] = None,
+) -> str:
+    """Generate the full markdown report.
+
+    The tools are independent subprocesses, so they run at once, up to
+    TOOL_WORKERS of them, and the report waits for the slowest instead of
+    the sum of all.
+    """
+    with ThreadPoolExecutor(max_workers=TOOL_WORKERS) as executor:
+        futures = submit_report_jobs(target, complexity_threshold, executor, prefetched)
+        results = {name: future.result() for name, future in futures.items()}
+    return render_report(target, complexity_threshold, results)
 
 
 def save_audit_report(file_path: Path, report: str) -> Path:
@@ -332,43 +450,26 @@ def save_audit_report(file_path: Path, report: str) -> Path:
 def check_tools() -> list[str]:
     """Check which tools are available and return list of missing ones."""
     tools = ["radon", "xenon", "cohesion", "bandit", "pylint", "vulture"]
-    missing = []
     
-    for tool in tools:
-        _, _, rc = run_command([tool, "--help"])
-        if rc == -1:
-            missing.append(tool)
-    
-    return missing
+    # A PATH lookup is what run_command would fail on; no need to start each tool
+    return [tool for tool in tools if shutil.which(tool) is None]
 
 
 def load_config_from_pyproject() -> Optional[Dict[str, Any]]:
     """Load configuration from pyproject.toml if it exists"""
-    if tomli is None:
+    found = find_tool_config("python_quality_audit")
+    if found is None:
         return None
 
-    # Look for pyproject.toml in current directory or parent directories
-    cwd = Path.cwd()
-    for path in [cwd] + list(cwd.parents):
-        pyproject_path = path / "pyproject.toml"
-        if pyproject_path.exists():
-            try:
-                with open(pyproject_path, "rb") as f:
-                    data = tomli.load(f)
-                    # Try specific config first
-                    config = data.get("tool", {}).get("python_quality_audit", {})
-                    if config:
-                        print(f"📋 Loaded config from: {pyproject_path}")
-                        return config
-            except Exception as e:
-                print(f"Warning: Could not load {pyproject_path}: {e}")
-                continue
-
-    return None
+    pyproject_path, _, config = found
+    print(f"📋 Loaded config from: {pyproject_path}")
+    return config
 
 
 def parse_arguments():
     """Parse command line arguments with pyproject.toml config support"""
+    import argparse  # Only needed when run from the command line
+
     # Load config from pyproject.toml
     config = load_config_from_pyproject()
 
@@ -461,9 +562,9 @@ def main():
             
         files_to_analyze = [target_path]
     else:
-        # Pattern mode
+        # Pattern mode; audit/ holds our own reports, so it is pruned too
         cwd = Path.cwd()
-        files_to_analyze = list(cwd.glob(args.pattern))
+        files_to_analyze = [Path(f) for f in find_python_files(cwd, args.pattern, AUDIT_SKIP_DIRS)]
         files_to_analyze = [f for f in files_to_analyze if f.suffix == '.py' and f.is_file()]
         
         if not files_to_analyze:
@@ -489,27 +590,39 @@ def main():
 
     # Analyze files
     total_files = len(files_to_analyze)
-    for i, file_path in enumerate(files_to_analyze, 1):
-        try:
-            file_rel = file_path.relative_to(Path.cwd())
-        except ValueError:
-            file_rel = file_path
+    
+    # Metrics radon reports per file are collected for all files up front,
+    # instead of one radon process per metric and file
+    prefetched = analyze_radon_batch([str(f.resolve()) for f in files_to_analyze]) if total_files > 1 else {}
+    
+    # Every file's tool runs share one pool, so at most TOOL_WORKERS tools
+    # run at once; reports are written and printed in order as they complete
+    with ThreadPoolExecutor(max_workers=TOOL_WORKERS) as executor:
+        file_jobs = [
+            submit_report_jobs(
+                str(file_path), args.complexity, executor, prefetched.get(str(file_path.resolve()))
+            )
+            for file_path in files_to_analyze
+        ]
+        for i, (file_path, futures) in enumerate(zip(files_to_analyze, file_jobs), 1):
+            results = {name: future.result() for name, future in futures.items()}
+            report = render_report(str(file_path), args.complexity, results)
+            report_path = save_audit_report(file_path, report)
+            try:
+                file_rel = file_path.relative_to(Path.cwd())
+            except ValueError:
+                file_rel = file_path
+                
+            print(f"\n📊 Analyzing ({i}/{total_files}): {file_rel}")
             
-        print(f"\n📊 Analyzing ({i}/{total_files}): {file_rel}")
-        
-        if missing_tools:
-            print(f"  ⚠️  Some tools unavailable, report will be incomplete")
-        
-        # Generate report
-        report = generate_report(str(file_path), args.complexity)
-        
-        # Save report
-        report_path = save_audit_report(file_path, report)
-        try:
-            report_rel = report_path.relative_to(Path.cwd())
-        except ValueError:
-            report_rel = report_path
-        print(f"  ✅ Report saved: {report_rel}")
+            if missing_tools:
+                print(f"  ⚠️  Some tools unavailable, report will be incomplete")
+            
+            try:
+                report_rel = report_path.relative_to(Path.cwd())
+            except ValueError:
+                report_rel = report_path
+            print(f"  ✅ Report saved: {report_rel}")
 
     print(f"\n✨ Analysis complete! Generated {total_files} audit report(s)")
 
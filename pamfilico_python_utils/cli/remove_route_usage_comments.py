@@ -6,98 +6,135 @@ Useful for cleaning up before re-running add_usage_comments tool.
 """
 
 import argparse
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union
 
-try:
-    import tomli
-except ImportError:
-    try:
-        import tomllib as tomli  # Python 3.11+
-    except ImportError:
-        tomli = None
+from pamfilico_python_utils.cli._config import find_tool_config
+from pamfilico_python_utils.cli._files import iter_python_files
+
+# Comment block markers, legacy and new format, in one alternation
+MARKER_PATTERN = re.compile(rb"# (START|END): (?:ROUTE )?USAGES TOOL")
+
+# Text common to every marker, checked before a file is scanned for blocks
+MARKER_TEXT = b"USAGES TOOL"
 
 
-def remove_all_blocks(lines: list) -> tuple:
+def remove_all_blocks(content: bytes) -> tuple:
     """Remove all ROUTE USAGES TOOL comment blocks (legacy and new format).
 
     Removes blocks with markers:
     - Legacy: # START: USAGES TOOL ... # END: USAGES TOOL
     - New: # START: ROUTE USAGES TOOL ... # END: ROUTE USAGES TOOL
 
+    A block is a START line through the next line with an END marker, however
+    long the block is. A START followed by another START before any END is
+    left in place, as is a START that is never closed. A block is only removed
+    when every line in it, markers included, is a comment; otherwise it is
+    left in place and its START line is reported. Markers are found in one
+    MARKER_PATTERN pass and the text between blocks is copied as slices.
+    The markers are ASCII, so the content is scanned as bytes without
+    decoding it.
+
     Args:
-        lines: List of file lines
+        content: File content as bytes
 
     Returns:
-        Tuple of (modified_lines, blocks_removed_count)
+        Tuple of (modified_content, blocks_removed_count, kept_block_lines),
+        where kept_block_lines lists the 1-based START line of each block left
+        in place because it holds non-comment lines
     """
     blocks_removed = 0
-    i = 0
+    kept_lines = []
+    out = []
+    copied = 0        # Content before this offset is already in out (or removed)
+    block_start = -1  # Offset of the line holding the open START marker, if any
+    line_end = 0      # End of the last marker's line; later markers on it are ignored
+
+    for match in MARKER_PATTERN.finditer(content):
+        marker = match.start()
+        if marker < line_end:
+            continue
+        line_end = _line_end(content, marker)
+
+        if match.group(1) == b"START":
+            block_start = content.rfind(b"\n", 0, marker) + 1
+        elif block_start != -1:
+            if _all_comment_lines(content[block_start:line_end]):
+                # Remove entire block
+                out.append(content[copied:block_start])
+                copied = line_end
+                blocks_removed += 1
+            else:
+                kept_lines.append(content.count(b"\n", 0, block_start) + 1)
+            block_start = -1
 
-    while i < len(lines):
-        # Check for BOTH legacy and new markers
-        if ('# START: USAGES TOOL' in lines[i] or
-            '# START: ROUTE USAGES TOOL' in lines[i]):
+    if not blocks_removed:
+        return content, 0, kept_lines
+    out.append(content[copied:])
+    return b"".join(out), blocks_removed, kept_lines
 
-            block_start = i
-            block_end = None
 
-            # Find matching END marker (legacy or new)
-            for j in range(i + 1, min(len(lines), i + 10)):
-                if ('# END: USAGES TOOL' in lines[j] or
-                    '# END: ROUTE USAGES TOOL' in lines[j]):
-                    block_end = j
-                    break
+def _all_comment_lines(block: bytes) -> bool:
+    """True if every line of block is a comment, so removing it drops no code"""
+    return all(line.lstrip().startswith(b"#") for line in block.splitlines())
 
-            if block_end is not None:
-                # Remove entire block
-                del lines[block_start:block_end + 1]
-                blocks_removed += 1
-                # Don't increment i - continue from same position
-            else:
-                i += 1
-        else:
-            i += 1
 
-    return lines, blocks_removed
+def _line_end(content: bytes, pos: int) -> int:
+    """Offset just past the newline ending the line at pos, or len(content)"""
+    newline = content.find(b"\n", pos)
+    return len(content) if newline == -1 else newline + 1
 
 
-def clean_file(file_path: Path, dry_run: bool = True) -> tuple:
+def clean_file(file_path: Union[str, Path], dry_run: bool = True) -> tuple:
     """Remove all comment blocks from a single file.
 
     Args:
-        file_path: Path to Python file
+        file_path: Path to Python file, as a string or Path
         dry_run: If True, don't write changes
 
     Returns:
-        Tuple of (blocks_removed, success)
+        Tuple of (blocks_removed, success, messages). Messages are returned
+        rather than printed so files can be cleaned in parallel.
     """
-    if not file_path.exists():
-        return 0, False
+    messages = []
 
+    # Only I/O can fail here; anything else is a bug and propagates
     try:
-        # Read file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        original_count = len(lines)
-
-        # Remove all blocks
-        lines, blocks_removed = remove_all_blocks(lines)
-
-        if blocks_removed > 0:
-            if not dry_run:
-                # Write back
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
-            return blocks_removed, True
-
-        return 0, True
-
-    except Exception as e:
-        print(f"  ❌ Error processing {file_path}: {e}")
-        return 0, False
+        # Read file, as bytes so line endings and encoding are kept as-is
+        with open(file_path, 'rb') as f:
+            content = f.read()
+    except FileNotFoundError:
+        return 0, False, messages
+    except OSError as e:
+        messages.append(f"  ❌ Error processing {file_path}: {e}")
+        return 0, False, messages
+
+    # Most files have no blocks (always so after the first run); skip the scan
+    if MARKER_TEXT not in content:
+        return 0, True, messages
+
+    # Remove all blocks
+    content, blocks_removed, kept_lines = remove_all_blocks(content)
+    for line in kept_lines:
+        messages.append(
+            f"  ⚠️  Kept block at {file_path}:{line}: it contains non-comment lines"
+        )
+
+    if blocks_removed > 0 and not dry_run:
+        # Write back
+        try:
+            with open(file_path, 'wb') as f:
+                f.write(content)
+        except OSError as e:
+            messages.append(f"  ❌ Error processing {file_path}: {e}")
+            return 0, False, messages
+
+    return blocks_removed, True, messages
 
 
 def load_config_from_pyproject() -> Optional[Dict[str, Any]]:
@@ -106,27 +143,14 @@ def load_config_from_pyproject() -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary with config or None if not found
     """
-    if tomli is None:
+    # Try to get config from add_usage_comments section
+    found = find_tool_config("add_usage_comments")
+    if found is None:
         return None
 
-    # Look for pyproject.toml in current directory or parent directories
-    cwd = Path.cwd()
-    for path in [cwd] + list(cwd.parents):
-        pyproject_path = path / "pyproject.toml"
-        if pyproject_path.exists():
-            try:
-                with open(pyproject_path, "rb") as f:
-                    data = tomli.load(f)
-                    # Try to get config from add_usage_comments section
-                    config = data.get("tool", {}).get("add_usage_comments", {})
-                    if config:
-                        print(f"📋 Loaded config from: {pyproject_path}")
-                        return config
-            except Exception as e:
-                print(f"Warning: Could not load {pyproject_path}: {e}")
-                continue
-
-    return None
+    pyproject_path, _, config = found
+    print(f"📋 Loaded config from: {pyproject_path}")
+    return config
 
 
 def parse_arguments():
@@ -203,7 +227,8 @@ def main():
     else:
         search_path = api_path
 
-    python_files = list(search_path.rglob("*.py"))
+    # Plain string paths from a scandir walk that skips virtualenvs and caches
+    python_files = list(iter_python_files(str(search_path)))
 
     if not python_files:
         print(f"❌ No Python files found in {search_path}")
@@ -221,17 +246,33 @@ def main():
     files_modified = 0
     files_processed = 0
 
-    for file_path in sorted(python_files):
-        rel_path = file_path.relative_to(backend_base)
-        blocks_removed, success = clean_file(file_path, dry_run=args.dry_run)
+    # Sorted by path components, as Path objects sort
+    python_files.sort(key=lambda file_path: file_path.split(os.sep))
+
+    # Files are independent, so clean them in parallel when there is more than one
+    if len(python_files) > 1:
+        with ProcessPoolExecutor() as executor:
+            results = list(
+                executor.map(clean_file, python_files, repeat(args.dry_run), chunksize=32)
+            )
+    else:
+        results = [clean_file(file_path, args.dry_run) for file_path in python_files]
+
+    # Per-file lines are collected and written in one go after the loop
+    log = []
+    status = "🔍 Would remove" if args.dry_run else "✅ Removed"
+    for file_path, (blocks_removed, success, messages) in zip(python_files, results):
+        log.extend(messages)
 
         if success:
             files_processed += 1
             if blocks_removed > 0:
                 files_modified += 1
                 total_blocks_removed += blocks_removed
-                status = "🔍 Would remove" if args.dry_run else "✅ Removed"
-                print(f"  {status} {blocks_removed} block(s) from {rel_path}")
+                rel_path = os.path.relpath(file_path, backend_base)
+                log.append(f"  {status} {blocks_removed} block(s) from {rel_path}")
+    if log:
+        print("\n".join(log))
 
     # Summary
     print()
@@ -12,16 +12,14 @@ This ensures comment blocks are always in sync with current frontend usage.
 import argparse
 import subprocess
 import sys
+from importlib import import_module
 from pathlib import Path
 from typing import Optional, Dict, Any
 
-try:
-    import tomli
-except ImportError:
-    try:
-        import tomllib as tomli  # Python 3.11+
-    except ImportError:
-        tomli = None
+from pamfilico_python_utils.cli._config import find_tool_tables
+
+# Tool tables merged into this tool's config, later ones taking precedence
+CONFIG_SECTIONS = ("remove_route_usage_comments", "flask_route_usage", "add_usage_comments")
 
 
 def load_config_from_pyproject() -> Optional[Dict[str, Any]]:
@@ -35,42 +33,18 @@ def load_config_from_pyproject() -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary with merged config or None if not found
     """
-    if tomli is None:
+    found = find_tool_tables(*CONFIG_SECTIONS)
+    if found is None:
         return None
 
-    # Look for pyproject.toml in current directory or parent directories
-    cwd = Path.cwd()
-    for path in [cwd] + list(cwd.parents):
-        pyproject_path = path / "pyproject.toml"
-        if pyproject_path.exists():
-            try:
-                with open(pyproject_path, "rb") as f:
-                    data = tomli.load(f)
-                    tool_config = data.get("tool", {})
-
-                    # Merge configs from all three tools
-                    config = {}
-
-                    # Remove config
-                    if "remove_route_usage_comments" in tool_config:
-                        config.update(tool_config["remove_route_usage_comments"])
-
-                    # Flask route usage config
-                    if "flask_route_usage" in tool_config:
-                        config.update(tool_config["flask_route_usage"])
-
-                    # Add usage comments config
-                    if "add_usage_comments" in tool_config:
-                        config.update(tool_config["add_usage_comments"])
-
-                    if config:
-                        print(f"📋 Loaded config from: {pyproject_path}")
-                        return config
-            except Exception as e:
-                print(f"Warning: Could not load {pyproject_path}: {e}")
-                continue
+    # Merge configs from all three tools
+    pyproject_path, tables = found
+    config = {}
+    for table in tables.values():
+        config.update(table)
 
-    return None
+    print(f"📋 Loaded config from: {pyproject_path}")
+    return config
 
 
 def run_command(command: list, description: str) -> bool:
@@ -105,6 +79,47 @@ def run_command(command: list, description: str) -> bool:
         return False
 
 
+def run_tool(tool: str, args: list, description: str, use_subprocess: bool = False) -> bool:
+    """Run one of this package's CLI tools and return success status
+
+    The tool's main() is called in this process, so each step skips a
+    Poetry and interpreter startup and shares the cached pyproject.toml.
+
+    Args:
+        tool: Module name under pamfilico_python_utils.cli (also the script name)
+        args: Command-line arguments for the tool
+        description: Human-readable description for output
+        use_subprocess: Run the tool via "poetry run" instead
+
+    Returns:
+        True if the tool succeeded, False otherwise
+    """
+    if use_subprocess:
+        return run_command(["poetry", "run", tool, *args], description)
+
+    print(f"\n{'=' * 60}")
+    print(f"📌 Step: {description}")
+    print(f"{'=' * 60}")
+
+    # The tool parses sys.argv itself, as it would as a script
+    saved_argv = sys.argv
+    sys.argv = [tool, *args]
+    try:
+        import_module(f"pamfilico_python_utils.cli.{tool}").main()
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            print(f"❌ {description} failed with exit code {e.code}")
+            return False
+    except Exception as e:
+        print(f"❌ {description} failed: {e}")
+        return False
+    finally:
+        sys.argv = saved_argv
+
+    print(f"✅ {description} completed successfully")
+    return True
+
+
 def parse_arguments():
     """Parse command line arguments
 
@@ -167,6 +182,12 @@ Note: This tool must be run from a directory containing pyproject.toml
         help='Skip the remove_route_usage_comments step (keep existing blocks)'
     )
 
+    parser.add_argument(
+        '--subprocess',
+        action='store_true',
+        help='Run each step via "poetry run" instead of in this process'
+    )
+
     parser.add_argument(
         '--skip-report',
         action='store_true',
@@ -207,9 +228,10 @@ def main():
 
     # Step 1: Remove existing comment blocks (unless skipped)
     if not args.skip_remove:
-        success = run_command(
-            ["poetry", "run", "remove_route_usage_comments"],
-            "Remove existing comment blocks"
+        success = run_tool(
+            "remove_route_usage_comments", [],
+            "Remove existing comment blocks",
+            args.subprocess
         )
         if not success:
             print("\n❌ Failed at step 1. Stopping execution.")
@@ -219,9 +241,10 @@ def main():
 
     # Step 2: Generate fresh usage reports (unless skipped)
     if not args.skip_report:
-        success = run_command(
-            ["poetry", "run", "flask_route_usage_report"],
-            "Generate fresh usage reports"
+        success = run_tool(
+            "flask_route_usage_report", [],
+            "Generate fresh usage reports",
+            args.subprocess
         )
         if not success:
             print("\n❌ Failed at step 2. Stopping execution.")
@@ -230,13 +253,10 @@ def main():
         print("\n⏭️  Skipping: Generate fresh usage reports")
 
     # Step 3: Add updated comment blocks
-    command = ["poetry", "run", "add_usage_comments"]
-    if args.dry_run:
-        command.append("--dry-run")
-
-    success = run_command(
-        command,
-        f"Add updated comment blocks {'(DRY RUN)' if args.dry_run else ''}"
+    success = run_tool(
+        "add_usage_comments", ["--dry-run"] if args.dry_run else [],
+        f"Add updated comment blocks {'(DRY RUN)' if args.dry_run else ''}",
+        args.subprocess
     )
     if not success:
         print("\n❌ Failed at step 3. Stopping execution.")
@@ -1,45 +1,89 @@
 """Flask utilities for routing, authentication, and error handling."""
 
-from pamfilico_python_utils.flask.auth import (
-    admin_required,
-    decode_jwe_token,
-    encode_jwe,
-    jwt_authenticator_with_scopes,
-    validate_uuid_params,
-)
-from pamfilico_python_utils.flask.auth_next import (
-    authenticatenext,
-    configure_authenticatenext,
-)
-from pamfilico_python_utils.flask.errors import (
-    AlreadyExistsError,
-    AuthenticationError,
-    BaseError,
-    BizlogicError,
-    DatabaseError,
-    DataNotFoundError,
-    EmailError,
-    EnvironmentVariableError,
-    InsuranceError,
-    LocationError,
-    NotFoundError,
-    QueueError,
-    ServerError,
-    StripeError,
-    SubscriptionExpiredError,
-    VehicleError,
-    init_errors,
-)
-from pamfilico_python_utils.flask.pagination import collection
-from pamfilico_python_utils.flask.responses import standard_response
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pamfilico_python_utils.flask.auth import (
+        admin_required,
+        clear_token_cache,
+        decode_jwe_token,
+        encode_jwe,
+        invalidate_user_cache,
+        jwt_authenticator_with_scopes,
+        validate_uuid_params,
+    )
+    from pamfilico_python_utils.flask.auth_next import (
+        authenticatenext,
+        configure_authenticatenext,
+    )
+    from pamfilico_python_utils.flask.errors import (
+        AlreadyExistsError,
+        AuthenticationError,
+        BaseError,
+        BizlogicError,
+        DatabaseError,
+        DataNotFoundError,
+        EmailError,
+        EnvironmentVariableError,
+        InsuranceError,
+        LocationError,
+        NotFoundError,
+        QueueError,
+        ServerError,
+        StripeError,
+        SubscriptionExpiredError,
+        VehicleError,
+        init_errors,
+        session_scope,
+    )
+    from pamfilico_python_utils.flask.pagination import collection
+    from pamfilico_python_utils.flask.responses import standard_response
+
+# Exports and the submodule each comes from. They are imported on first
+# access, so using standard_response does not load the JWE and SQLAlchemy
+# dependencies of auth and errors.
+_EXPORTS = {
+    "admin_required": "pamfilico_python_utils.flask.auth",
+    "clear_token_cache": "pamfilico_python_utils.flask.auth",
+    "decode_jwe_token": "pamfilico_python_utils.flask.auth",
+    "encode_jwe": "pamfilico_python_utils.flask.auth",
+    "invalidate_user_cache": "pamfilico_python_utils.flask.auth",
+    "jwt_authenticator_with_scopes": "pamfilico_python_utils.flask.auth",
+    "validate_uuid_params": "pamfilico_python_utils.flask.auth",
+    "authenticatenext": "pamfilico_python_utils.flask.auth_next",
+    "configure_authenticatenext": "pamfilico_python_utils.flask.auth_next",
+    "AlreadyExistsError": "pamfilico_python_utils.flask.errors",
+    "AuthenticationError": "pamfilico_python_utils.flask.errors",
+    "BaseError": "pamfilico_python_utils.flask.errors",
+    "BizlogicError": "pamfilico_python_utils.flask.errors",
+    "DatabaseError": "pamfilico_python_utils.flask.errors",
+    "DataNotFoundError": "pamfilico_python_utils.flask.errors",
+    "EmailError": "pamfilico_python_utils.flask.errors",
+    "EnvironmentVariableError": "pamfilico_python_utils.flask.errors",
+    "InsuranceError": "pamfilico_python_utils.flask.errors",
+    "LocationError": "pamfilico_python_utils.flask.errors",
+    "NotFoundError": "pamfilico_python_utils.flask.errors",
+    "QueueError": "pamfilico_python_utils.flask.errors",
+    "ServerError": "pamfilico_python_utils.flask.errors",
+    "StripeError": "pamfilico_python_utils.flask.errors",
+    "SubscriptionExpiredError": "pamfilico_python_utils.flask.errors",
+    "VehicleError": "pamfilico_python_utils.flask.errors",
+    "init_errors": "pamfilico_python_utils.flask.errors",
+    "session_scope": "pamfilico_python_utils.flask.errors",
+    "collection": "pamfilico_python_utils.flask.pagination",
+    "standard_response": "pamfilico_python_utils.flask.responses",
+}
 
 __all__ = [
     # Auth
     "admin_required",
     "authenticatenext",
+    "clear_token_cache",
     "configure_authenticatenext",
     "decode_jwe_token",
     "encode_jwe",
+    "invalidate_user_cache",
     "jwt_authenticator_with_scopes",
     "validate_uuid_params",
     # Errors
@@ -60,8 +104,22 @@ __all__ = [
     "SubscriptionExpiredError",
     "VehicleError",
     "init_errors",
+    "session_scope",
     # Pagination
     "collection",
     # Responses
     "standard_response",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -11,6 +11,10 @@ validate_uuid_params
     Decorator for validating UUID parameters in request paths
 encode_jwe/decode_jwe
     Utilities for handling JWE (JSON Web Encryption) token encryption/decryption
+clear_token_cache
+    Drop the cached results of decode_jwe_token
+lookup_auth/invalidate_user_cache
+    Cached user and staff lookups behind the authentication decorators
 
 Features
 --------
@@ -38,25 +42,43 @@ Notes
 -----
 The module requires certain environment variables to be set:
     - NEXTAUTH_SECRET: Secret key used for JWT encryption/decryption
+
+Verified token payloads are cached for TOKEN_CACHE_TTL seconds, so a token
+sent with every request is only decrypted once in that window. User lookups
+are cached for USER_CACHE_TTL seconds in the same way.
 """
 
+import binascii
+import hashlib
 import json
 import logging
 import os
+import re
+import sys
 import uuid
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import Any, Callable, Dict, List, Optional, Union
 
 from dotenv import load_dotenv
 from flask import request
 from hkdf import Hkdf
+from jose.exceptions import JWEError, JWEParseError
 from jose.jwe import decrypt, encrypt
+from jose.utils import base64url_decode
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:  # Every token then goes through jose
+    AESGCM = None
 
+from pamfilico_python_utils._cache import TTLCache
 from pamfilico_python_utils.flask.errors import (
     AuthenticationError,
     EnvironmentVariableError,
     NotFoundError,
     ServerError,
+    session_scope,
 )
 from pamfilico_python_utils.flask.responses import standard_response
 
@@ -64,15 +86,56 @@ from pamfilico_python_utils.flask.responses import standard_response
 logger = logging.getLogger(__name__)
 
 
+# Read once at import; auth_next shares these rather than loading .env again
 load_dotenv(override=True)
 
 NEXTAUTH_SECRET = os.getenv("NEXTAUTH_SECRET")
 TOKEN_NAME = os.getenv("TOKEN_NAME", "CARFAST_TOKEN")
 
+# Roles a token may carry, roles looked up as users, and roles every
+# decorated endpoint allows on top of its own scopes
+TOKEN_ROLES = ["user", "admin", "staff", "client", ""]
+USER_ROLES = frozenset({"user", ""})
+DEFAULT_SCOPES = frozenset({"admin", ""})
+
+# Authorization header scheme accepted by admin_required
+BEARER_PREFIX = "Bearer "
+
+# Canonical hyphenated UUIDs, accepted by validate_uuid_params without
+# building a uuid.UUID; other spellings are still left to uuid.UUID
+UUID_PATTERN = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+
+# Verified decode_jwe_token results, keyed by a 128-bit BLAKE2b token hash,
+# the secret and the roles; the hash only needs to be collision-free, not slow.
+# Failed verifications are never cached, so bad tokens are always re-checked.
+TOKEN_CACHE_TTL = 30
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL)
+
+# lookup_auth results, keyed by models, role, email and id from the token
+USER_CACHE_TTL = 60
+_user_cache = TTLCache(maxsize=5000, ttl=USER_CACHE_TTL)
+
+
+class _LazyJson:
+    """Log argument that pretty-prints its payload only if the record is emitted."""
+
+    __slots__ = ("payload",)
 
+    def __init__(self, payload: Any):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        return json.dumps(self.payload, indent=2)
+
+
+@lru_cache(maxsize=4)
 def __encryption_key(secret: str):
     """Generate an encryption key from a secret using HKDF.
 
+    The key only depends on the secret, so it is derived once per secret.
+
     Parameters
     ----------
     secret : str
@@ -88,6 +151,64 @@ def __encryption_key(secret: str):
     )
 
 
+def _decode_segment(segment: str, error: str) -> bytes:
+    """Base64url-decode a JWE segment, raising jose's JWEParseError on failure."""
+    try:
+        return base64url_decode(segment.encode("ascii"))
+    except (binascii.Error, UnicodeEncodeError):
+        raise JWEParseError(error)
+
+
+def _decrypt(token: str, key: bytes) -> Optional[bytes]:
+    """Decrypt a compact JWE token, as jose.jwe.decrypt does.
+
+    NextAuth tokens use direct encryption with A256GCM. Those are decrypted
+    with cryptography's AESGCM directly, skipping jose's key construction and
+    algorithm dispatch; a token that fails authentication there raises the
+    same JWEError jose would. Tokens with any other header go through jose.
+
+    Parameters
+    ----------
+    token : str
+        The compact serialized JWE
+    key : bytes
+        The 32-byte encryption key
+
+    Returns
+    -------
+    Optional[bytes]
+        The decrypted payload
+
+    Raises
+    ------
+    JWEError
+        If the token cannot be decrypted
+    """
+    parts = token.split(".")
+    if AESGCM is not None and len(parts) == 5 and not parts[1] and len(key) == 32:
+        header_segment, _, iv_segment, cipher_text_segment, auth_tag_segment = parts
+        try:
+            header = json.loads(base64url_decode(header_segment.encode("ascii")))
+            fast_path = (
+                header.get("alg") == "dir"
+                and header.get("enc") == "A256GCM"
+                and "zip" not in header
+            )
+        except (ValueError, TypeError, AttributeError):
+            fast_path = False
+        if fast_path:
+            iv = _decode_segment(iv_segment, "Invalid IV")
+            cipher_text = _decode_segment(cipher_text_segment, "Invalid cyphertext")
+            auth_tag = _decode_segment(auth_tag_segment, "Invalid auth tag")
+            try:
+                return AESGCM(key).decrypt(
+                    iv, cipher_text + auth_tag, header_segment.encode("ascii")
+                )
+            except (InvalidTag, ValueError):
+                raise JWEError("Invalid JWE Auth Tag")
+    return decrypt(token, key)
+
+
 # TODO: fc9a6086-bc7e-46a8-92a1-53aec141f41b - Add expiration
 def encode_jwe(payload: Dict[str, Any], secret: str):
     """Encode a payload into a JWE token.
@@ -106,7 +227,7 @@ def encode_jwe(payload: Dict[str, Any], secret: str):
     """
     if secret is None:
         raise EnvironmentVariableError("Missing NEXTAUTH_SECRET")
-    data = bytes(json.dumps(payload), "utf-8")
+    data = json.dumps(payload).encode("utf-8")
     key = __encryption_key(secret)
     return bytes.decode(encrypt(data, key), "utf-8")
 
@@ -129,15 +250,45 @@ def decode_jwe_token(token: str, secret: str, roles: Optional[List[str]] = None)
         Dictionary containing verification status, error message, email, and role
     """
     roles = roles or ["user", ""]
-    token_decrypted = decrypt(token, __encryption_key(secret))
+    cache_key = (
+        hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest(), secret, tuple(roles)
+    )
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
+    token_decoded = _decode_jwe_token(token, secret, roles)
+    if token_decoded["verified"]:
+        _token_cache.set(cache_key, dict(token_decoded))
+    return token_decoded
+
+
+def clear_token_cache():
+    """Drop all cached decode_jwe_token results.
+
+    Call this when a token is revoked or the secret is rotated, so the
+    change takes effect before the cached entries expire.
+    """
+    _token_cache.clear()
+
+
+def _decode_jwe_token(token: str, secret: str, roles: List[str]):
+    """Uncached decode_jwe_token."""
+    # A compact JWE has exactly five segments; anything else is rejected
+    # before any key derivation or decryption
+    if token.count(".") != 4:
+        return {"verified": False, "error": "Malformed token", "email": "", "role": ""}
+    token_decrypted = _decrypt(token, __encryption_key(secret))
     if token_decrypted is None:
         return {"verified": False, "error": "Invalid token", "email": "", "role": ""}
-    token_decrypted_decoded = json.loads(bytes.decode(token_decrypted, "utf-8"))
+    # json.loads detects and decodes UTF-8 bytes itself
+    token_decrypted_decoded = json.loads(token_decrypted)
     role = token_decrypted_decoded.get("role", "")
+    if isinstance(role, str):
+        # Interned, so the role checks downstream compare by identity first
+        role = sys.intern(role)
     if role not in roles:
-        logger.error(
-            "Invalid role: %s %s", role, json.dumps(token_decrypted_decoded, indent=2)
-        )
+        logger.error("Invalid role: %s %s", role, _LazyJson(token_decrypted_decoded))
         return {"verified": False, "error": "Invalid role", "email": "", "role": ""}
     if token_decrypted:
         if role == "user":
@@ -145,7 +296,7 @@ def decode_jwe_token(token: str, secret: str, roles: Optional[List[str]] = None)
                 "verified": True,
                 "error": None,
                 "email": token_decrypted_decoded.get("email", ""),
-                "role": token_decrypted_decoded.get("role", ""),
+                "role": role,
                 "id": token_decrypted_decoded.get("id", ""),
             }
             return user_payload_serialized
@@ -154,13 +305,130 @@ def decode_jwe_token(token: str, secret: str, roles: Optional[List[str]] = None)
             user_payload_serialized = {
                 "verified": True,
                 "error": None,
-                "role": token_decrypted_decoded.get("role", ""),
+                "role": role,
                 "id": token_decrypted_decoded.get("id", ""),
             }
             return user_payload_serialized
     return {"verified": False, "error": "Invalid token", "email": "", "role": ""}
 
 
+def lookup_auth(
+    db_session_factory: Callable,
+    user_model: Any,
+    staff_model: Optional[Any],
+    role: str,
+    user_email: Optional[str],
+    human_id: Any,
+    close_session: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """Look up the user (and staff member) a verified token belongs to.
+
+    Results are cached for USER_CACHE_TTL seconds per models, role, email
+    and id, so repeated requests with the same token skip the database
+    session entirely. Use invalidate_user_cache when a user is removed or
+    logs out, or a staff member's access changes.
+
+    Parameters
+    ----------
+    db_session_factory : Callable
+        Function that returns a database session
+    user_model : Any
+        User model class for database queries
+    staff_model : Optional[Any]
+        Staff model class for database queries
+    role : str
+        Role from the token
+    user_email : Optional[str]
+        Email from the token
+    human_id : Any
+        Id from the token
+    close_session : bool, optional
+        Close the session after the lookup, by default True
+
+    Returns
+    -------
+    Optional[Dict[str, Any]]
+        The ``auth`` kwargs for the endpoint, or None if the role needs no lookup
+
+    Raises
+    ------
+    AuthenticationError
+        If the user or staff member is not found
+    """
+    # Roles with no lookup (admin, client, staff without a staff model) never
+    # need a session
+    if role not in USER_ROLES and not (role == "staff" and staff_model):
+        return None
+
+    cache_key = (user_model, staff_model, role, user_email, human_id)
+    auth = _user_cache.get(cache_key)
+    if auth is not None:
+        return dict(auth)
+
+    with session_scope(db_session_factory, close_session) as session:
+        if role in USER_ROLES:
+            user = (
+                session.query(user_model).filter_by(email=user_email).first()
+            )
+            if not user:
+                raise AuthenticationError(f"User not found with email: {user_email}")
+            auth = {
+                "email": user_email,
+                "id": user.id,
+                "role": "user",
+            }
+
+        if role == "staff" and staff_model:
+            staff = (
+                session.query(staff_model).filter(staff_model.id == str(human_id)).first()
+            )
+            if not staff:
+                raise AuthenticationError(f"staff not found with id: {human_id}")
+            user = session.query(user_model).get(staff.user_id)
+            if not user:
+                raise AuthenticationError(f"User not found with email: {user_email}")
+            auth = {
+                "email": user_email,
+                "id": user.id,
+                "user_id": user.id,
+                "staff_id": staff.id,
+                "role": "staff",
+            }
+
+    if auth is not None:
+        _user_cache.set(cache_key, dict(auth))
+    return auth
+
+
+def invalidate_user_cache(email: Optional[str] = None, user_id: Any = None):
+    """Drop cached lookup_auth results, all of them when no argument is given.
+
+    Staff tokens carry no email, so their entries are only matched by id.
+
+    Parameters
+    ----------
+    email : Optional[str], optional
+        Drop the entries looked up with this email
+    user_id : Any, optional
+        Drop the entries whose token id, user id or staff id equals this id
+    """
+    if email is None and user_id is None:
+        _user_cache.clear()
+        return
+    user_id = None if user_id is None else str(user_id)
+
+    def matches(key, auth):
+        if email is not None and key[3] == email:
+            return True
+        return user_id is not None and user_id in {
+            str(value)
+            for value in (key[4], auth.get("id"), auth.get("user_id"), auth.get("staff_id"))
+            if value is not None
+        }
+
+    _user_cache.discard(matches)
+
+
 def jwt_authenticator_with_scopes(
     scopes: Union[None, List[str], Callable[..., Any]] = None,
     db_session_factory: Optional[Callable] = None,
@@ -203,24 +471,22 @@ def jwt_authenticator_with_scopes(
         return jwt_authenticator_with_scopes()(scopes)
 
     scopes = scopes or ["user", ""]
-    default_scopes = ["admin", ""]
+    # Roles allowed through, as a set built once per decorated endpoint
+    allowed_roles = frozenset(scopes) | DEFAULT_SCOPES
 
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            token = request.headers.get(TOKEN_NAME, None)
+            token = request.headers.get(TOKEN_NAME)
             if token is None:
                 raise AuthenticationError("No token provided")
             if NEXTAUTH_SECRET is None:
                 raise ServerError("NEXTAUTH_SECRET is missing.")
             token_decoded = decode_jwe_token(
-                token, NEXTAUTH_SECRET, roles=["user", "admin", "staff", "client", ""]
+                token, NEXTAUTH_SECRET, roles=TOKEN_ROLES
             )
 
-            role = token_decoded["role"]
-            user_email = token_decoded.get("email")
-            human_id = token_decoded["id"]
-
+            # Failed verifications carry no id, so check before reading it
             if not token_decoded["verified"]:
                 logger.warning("Invalid token: %s", token_decoded["error"])
                 return standard_response(
@@ -230,7 +496,11 @@ def jwt_authenticator_with_scopes(
                     status_code=401,
                 )
 
-            if role not in scopes + default_scopes:
+            role = token_decoded["role"]
+            user_email = token_decoded.get("email")
+            human_id = token_decoded["id"]
+
+            if role not in allowed_roles:
                 return standard_response(
                     data=None,
                     error=True,
@@ -240,44 +510,11 @@ def jwt_authenticator_with_scopes(
 
             # If database models are provided, perform database lookups
             if db_session_factory and user_model:
-                session = db_session_factory()
-                try:
-                    if (role == "user") | (role == ""):
-                        user = (
-                            session.query(user_model).filter_by(email=user_email).first()
-                        )
-                        if not user:
-                            raise AuthenticationError(
-                                f"User not found with email: {user_email}", session
-                            )
-                        kwargs["auth"] = {
-                            "email": user_email,
-                            "id": user.id,
-                            "role": "user",
-                        }
-
-                    if role == "staff" and staff_model:
-                        staff = (
-                            session.query(staff_model).filter(staff_model.id == str(human_id)).first()
-                        )
-                        if not staff:
-                            raise AuthenticationError(
-                                f"staff not found with id: {human_id}", session
-                            )
-                        user = session.query(user_model).get(staff.user_id)
-                        if not user:
-                            raise AuthenticationError(
-                                f"User not found with email: {user_email}", session
-                            )
-                        kwargs["auth"] = {
-                            "email": user_email,
-                            "id": user.id,
-                            "user_id": user.id,
-                            "staff_id": staff.id,
-                            "role": "staff",
-                        }
-                finally:
-                    session.close()
+                auth = lookup_auth(
+                    db_session_factory, user_model, staff_model, role, user_email, human_id
+                )
+                if auth is not None:
+                    kwargs["auth"] = auth
             else:
                 # No database lookup - just pass token data
                 kwargs["auth"] = {
@@ -315,11 +552,14 @@ def validate_uuid_params(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
         for param, value in kwargs.items():
-            if param.endswith("_id"):
-                try:
-                    uuid.UUID(value, version=4)
-                except ValueError as exc:
-                    raise NotFoundError(f"Invalid UUID: {value}.") from exc
+            if not param.endswith("_id"):
+                continue
+            if isinstance(value, str) and UUID_PATTERN.fullmatch(value):
+                continue
+            try:
+                uuid.UUID(value, version=4)
+            except ValueError as exc:
+                raise NotFoundError(f"Invalid UUID: {value}.") from exc
 
         return func(*args, **kwargs)
 
@@ -343,14 +583,17 @@ def admin_required(admin_token_manager: Optional[Any] = None):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Get token from Authorization header or ADMIN-TOKEN header
-            auth_header = request.headers.get("Authorization")
-            admin_token_header = request.headers.get("ADMIN-TOKEN")
+            # Get token from Authorization header or ADMIN-TOKEN header,
+            # resolving the request proxy once for both
+            headers = request.headers
+            auth_header = headers.get("Authorization")
+            admin_token_header = headers.get("ADMIN-TOKEN")
 
             token = None
 
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header.split(" ")[1]
+            if auth_header and auth_header.startswith(BEARER_PREFIX):
+                # Same token as split(" ")[1]: up to the next space, if any
+                token = auth_header[len(BEARER_PREFIX):].partition(" ")[0]
             elif admin_token_header:
                 token = admin_token_header
 
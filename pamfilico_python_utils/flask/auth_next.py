@@ -5,35 +5,38 @@ This module provides NextAuth.js-compatible JWT authentication with database loo
 """
 
 import logging
-import os
 from functools import wraps
 from typing import Any, Callable, List, Optional, Union
 
-from dotenv import load_dotenv
 from flask import request
 
-from pamfilico_python_utils.flask.auth import decode_jwe_token
+from pamfilico_python_utils.flask.auth import (
+    DEFAULT_SCOPES,
+    NEXTAUTH_SECRET,
+    TOKEN_NAME,
+    TOKEN_ROLES,
+    decode_jwe_token,
+    lookup_auth,
+)
 from pamfilico_python_utils.flask.errors import AuthenticationError, ServerError
 from pamfilico_python_utils.flask.responses import standard_response
 
 
 logger = logging.getLogger(__name__)
-load_dotenv(override=True)
-
-NEXTAUTH_SECRET = os.getenv("NEXTAUTH_SECRET")
-TOKEN_NAME = os.getenv("TOKEN_NAME", "CARFAST_TOKEN")
 
 
 # Module-level configuration
 _db_session_factory: Optional[Callable] = None
 _master_model: Optional[Any] = None
 _slave_model: Optional[Any] = None
+_close_session: bool = True
 
 
 def configure_authenticatenext(
     db_session_factory: Callable,
     masterModel: Any,
     slaveModel: Optional[Any] = None,
+    close_session: bool = True,
 ):
     """
     Configure the authenticatenext decorator with database session and models.
@@ -49,6 +52,10 @@ def configure_authenticatenext(
         Master model class for database queries (e.g., User model)
     slaveModel : Any, optional
         Slave model class for database queries (e.g., Staff model)
+    close_session : bool, optional
+        Close the session after each lookup. Defaults to True. Pass False
+        for a scoped_session that the application removes with ``remove()``
+        in a teardown handler, so the request reuses the lookup's session.
 
     Examples
     --------
@@ -72,10 +79,11 @@ def configure_authenticatenext(
     >>> def protected_endpoint(auth):
     ...     return {'user_id': auth['id']}
     """
-    global _db_session_factory, _master_model, _slave_model
+    global _db_session_factory, _master_model, _slave_model, _close_session
     _db_session_factory = db_session_factory
     _master_model = masterModel
     _slave_model = slaveModel
+    _close_session = close_session
     logger.info("authenticatenext configured with masterModel=%s, slaveModel=%s",
                 masterModel.__name__ if masterModel else None,
                 slaveModel.__name__ if slaveModel else None)
@@ -145,24 +153,22 @@ def authenticatenext(
         )
 
     scopes = scopes or ["user", ""]
-    default_scopes = ["admin", ""]
+    # Roles allowed through, as a set built once per decorated endpoint
+    allowed_roles = frozenset(scopes) | DEFAULT_SCOPES
 
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            token = request.headers.get(TOKEN_NAME, None)
+            token = request.headers.get(TOKEN_NAME)
             if token is None:
                 raise AuthenticationError("No token provided")
             if NEXTAUTH_SECRET is None:
                 raise ServerError("NEXTAUTH_SECRET is missing.")
             token_decoded = decode_jwe_token(
-                token, NEXTAUTH_SECRET, roles=["user", "admin", "staff", "client", ""]
+                token, NEXTAUTH_SECRET, roles=TOKEN_ROLES
             )
 
-            role = token_decoded["role"]
-            user_email = token_decoded.get("email")
-            human_id = token_decoded["id"]
-
+            # Failed verifications carry no id, so check before reading it
             if not token_decoded["verified"]:
                 logger.warning("Invalid token: %s", token_decoded["error"])
                 return standard_response(
@@ -172,7 +178,11 @@ def authenticatenext(
                     status_code=401,
                 )
 
-            if role not in scopes + default_scopes:
+            role = token_decoded["role"]
+            user_email = token_decoded.get("email")
+            human_id = token_decoded["id"]
+
+            if role not in allowed_roles:
                 return standard_response(
                     data=None,
                     error=True,
@@ -180,44 +190,17 @@ def authenticatenext(
                     status_code=403,
                 )
 
-            session = _db_session_factory()
-            try:
-                if (role == "user") | (role == ""):
-                    master = (
-                        session.query(_master_model).filter_by(email=user_email).first()
-                    )
-                    if not master:
-                        raise AuthenticationError(
-                            f"User not found with email: {user_email}", session
-                        )
-                    kwargs["auth"] = {
-                        "email": user_email,
-                        "id": master.id,
-                        "role": "user",
-                    }
-
-                if role == "staff" and _slave_model:
-                    slave = (
-                        session.query(_slave_model).filter(_slave_model.id == str(human_id)).first()
-                    )
-                    if not slave:
-                        raise AuthenticationError(
-                            f"staff not found with id: {human_id}", session
-                        )
-                    master = session.query(_master_model).get(slave.user_id)
-                    if not master:
-                        raise AuthenticationError(
-                            f"User not found with email: {user_email}", session
-                        )
-                    kwargs["auth"] = {
-                        "email": user_email,
-                        "id": master.id,
-                        "user_id": master.id,
-                        "staff_id": slave.id,
-                        "role": "staff",
-                    }
-            finally:
-                session.close()
+            auth = lookup_auth(
+                _db_session_factory,
+                _master_model,
+                _slave_model,
+                role,
+                user_email,
+                human_id,
+                _close_session,
+            )
+            if auth is not None:
+                kwargs["auth"] = auth
 
             return f(*args, **kwargs)
 
@@ -1,5 +1,5 @@
 import logging
-import traceback
+from contextlib import contextmanager
 
 from marshmallow.exceptions import ValidationError
 from sqlalchemy.exc import DataError, IntegrityError, OperationalError
@@ -13,18 +13,55 @@ DEBUG = True  # global variable setting the debug config
 
 
 class BaseError(Exception):
+    # Passing a session rolls it back and closes it as the error is created.
+    # Prefer raising inside session_scope, which does this once at the right
+    # scope and keeps creating an error free of database I/O.
     def __init__(self, message, session=None):
         self.session = session
         super().__init__(message)
         if self.session:
             try:
-                logger.error("RollingBack session")
-                self.session.rollback()
+                _rollback_if_needed(self.session)
                 self.session.close()
             except Exception as e:  # pylint: disable=broad-except
-                logger.error("Error rolling back session: %s", e)
-                traceback_info = traceback.format_exc()
-                logger.error("Traceback: %s", traceback_info)
+                logger.error("Error rolling back session: %s", e, exc_info=True)
+
+
+def _rollback_if_needed(session):
+    """Roll session back, skipping the ROLLBACK round trip if nothing began.
+
+    An error raised before any SQL ran leaves the session without a
+    transaction or pending changes, so there is nothing to undo.
+    """
+    # scoped_session does not proxy in_transaction, so always roll those back
+    in_transaction = getattr(session, "in_transaction", None)
+    if (
+        in_transaction is None
+        or in_transaction()
+        or session.new
+        or session.dirty
+        or session.deleted
+    ):
+        logger.error("RollingBack session")
+        session.rollback()
+
+
+@contextmanager
+def session_scope(session_factory, close=True):
+    """Yield a new session, rolling it back on a BaseError and closing it.
+
+    Pass close=False for a scoped_session whose removal is left to the
+    application's request teardown.
+    """
+    session = session_factory()
+    try:
+        yield session
+    except BaseError:
+        _rollback_if_needed(session)
+        raise
+    finally:
+        if close:
+            session.close()
 
 
 class BizlogicError(BaseError):
@@ -142,11 +179,36 @@ class PaymentHasBookingError(BaseError):
     pass
 
 
+# Errors answered with their message as the ui_message:
+# (exception, log label, log level, status code, log traceback)
+MESSAGE_ERROR_HANDLERS = (
+    (NotFoundError, "NotFoundError", logging.INFO, 404, False),
+    (VehicleError, "VehicleError", logging.ERROR, 400, False),
+    (AuthenticationError, "AuthenticationError", logging.ERROR, 401, False),
+    (ValueError, "ValueError", logging.ERROR, 400, True),
+    (AlreadyExistsError, "ResourceExistsError", logging.ERROR, 409, False),
+    (StripeError, "StripeError", logging.ERROR, 404, True),
+)
+
+
+def _message_error_handler(label, level, status_code, log_traceback):
+    def handler(error):
+        # logging formats the message and traceback only if the record is emitted
+        logger.log(level, "%s: %s", label, error, exc_info=log_traceback)
+        return standard_response(error=True, ui_message=str(error), status_code=status_code)
+
+    return handler
+
+
 def init_errors(app):
+    for exception, label, level, status_code, log_traceback in MESSAGE_ERROR_HANDLERS:
+        app.register_error_handler(
+            exception, _message_error_handler(label, level, status_code, log_traceback)
+        )
+
     @app.errorhandler(409)
     def conflict_error(error):
         logger.error(error)
-        traceback.print_exc()
         return standard_response(
             error=True,
             message="Conflict",
@@ -163,34 +225,19 @@ def init_errors(app):
             status_code=403,
         )
 
-    @app.errorhandler(NotFoundError)
-    def resource_not_found_error(error):
-        logger.info("NotFoundError: %s", error)
-        msg = str(error)
-        return standard_response(error=True, ui_message=msg, status_code=404)
-
-    @app.errorhandler(VehicleError)
-    def vehicle_error(error):
-        logger.error("VehicleError: %s", error)
-        return standard_response(error=True, ui_message=str(error), status_code=400)
-
-    @app.errorhandler(AuthenticationError)
-    def authentication_error(error):
-        logger.error("AuthenticationError: %s", error)
-        msg = str(error)
-        return standard_response(error=True, ui_message=msg, status_code=401)
-
     @app.errorhandler(ValidationError)
     def validation_error(error):
         logger.error(error.messages)
-        print(error.messages)
-        errors = []
-        for field, messages in error.messages.items():
-            if isinstance(messages, list):
-                errors.extend([f"{field}: {msg}" for msg in messages])
-            else:
-                errors.append(f"{field}: {messages}")
-        error_message = "; ".join(errors) if errors else "Validation error"
+        # A ValidationError raised with a plain message has no field mapping
+        field_messages = error.messages
+        if not isinstance(field_messages, dict):
+            field_messages = {"_schema": field_messages}
+        errors = [
+            f"{field}: {msg}"
+            for field, messages in field_messages.items()
+            for msg in (messages if isinstance(messages, list) else (messages,))
+        ]
+        error_message = "; ".join(errors) or "Validation error"
         return standard_response(
             error=True,
             message=error_message,
@@ -198,23 +245,6 @@ def init_errors(app):
             status_code=400,
         )
 
-    @app.errorhandler(ValueError)
-    def value_error(error):
-        logger.error("ValueError: %s", error)
-        traceback_info = traceback.format_exc()
-        logger.error("Traceback: %s", traceback_info)
-        return standard_response(error=True, ui_message=str(error), status_code=400)
-
-    @app.errorhandler(AlreadyExistsError)
-    def resource_exist_error(error):
-        logger.error("ResourceExistsError: %s", error)
-        msg = str(error)
-        return standard_response(
-            error=True,
-            ui_message=msg,
-            status_code=409,
-        )
-
     @app.errorhandler(DataError)
     def data_error(error):
         logger.error("DataError: %s", error)
@@ -247,11 +277,9 @@ def init_errors(app):
 
     @app.errorhandler(DatabaseError)
     def database_error_handler(error):
-        logger.error("DatabaseError: %s", error)
-        traceback_info = traceback.format_exc()
-        logger.error("Traceback: %s", traceback_info)
+        logger.error("DatabaseError: %s", error, exc_info=True)
         msg = str(error)
-        if "unique" in str(error):
+        if "unique" in msg:
             msg = "Object already exists."
         return standard_response(
             error=True,
@@ -271,11 +299,9 @@ def init_errors(app):
 
     @app.errorhandler(Exception)
     def handle_exception(e):
-        logger.error(e)
-        traceback.print_exc()
+        logger.error(e, exc_info=True)
         if isinstance(e, HTTPException):
             return e
-        print(e)
         res = {
             "code": 500,
             "errorType": "Internal Server Error",
@@ -290,15 +316,3 @@ def init_errors(app):
             ui_message="Internal Server Error",
             status_code=500,
         )
-
-    @app.errorhandler(StripeError)
-    def stripe_error(error):
-        msg = str(error)
-        logger.error("StripeError: %s", error)
-        traceback_info = traceback.format_exc()
-        logger.error("Traceback: %s", traceback_info)
-        return standard_response(
-            error=True,
-            ui_message=msg,
-            status_code=404,
-        )
@@ -1,5 +1,16 @@
-from functools import wraps
+from functools import lru_cache, wraps
 from flask import request, jsonify
+from sqlalchemy import func
+
+# Label of the window-function column carrying the total row count
+TOTAL_COUNT_LABEL = "__total"
+
+# Search modes for searchable_fields given as a dict:
+# ilike - '%value%' match, a full scan unless indexed with pg_trgm
+# prefix - 'value%' match, can use a B-tree index (text_pattern_ops on PostgreSQL)
+# trgm - pg_trgm similarity (column % value), ranked by similarity; needs
+#        CREATE EXTENSION pg_trgm and a GIN (column gin_trgm_ops) index
+SEARCH_MODES = frozenset(["ilike", "prefix", "trgm"])
 
 
 def collection(MarshmallowSchema, searchable_fields=None, sortable_fields=None):
@@ -8,19 +19,30 @@ def collection(MarshmallowSchema, searchable_fields=None, sortable_fields=None):
 
     Args:
         MarshmallowSchema: A Marshmallow schema class for serialization
-        searchable_fields (list): List of field names that can be searched (e.g., ['first_name', 'email'])
+        searchable_fields (list or dict): Field names that can be searched (e.g., ['first_name', 'email']),
+            or a dict mapping each to a search mode from SEARCH_MODES (e.g., {'name': 'trgm', 'email': 'prefix'}).
+            Fields given as a list use 'ilike'.
         sortable_fields (list): List of field names that can be sorted (e.g., ['first_name', 'created_at'])
 
     Query Parameters:
         results_per_page (int): Number of results per page (default: 10, max: 100)
         page_number (int): Page number to retrieve (default: 1)
         search_by (str): Field name to search by (must be in searchable_fields)
-        search_value (str): Value to search for (case-insensitive partial match)
+        search_value (str): Value to search for (case-insensitive partial match by default)
         order_by (str): Field name to sort by (must be in sortable_fields)
         order_direction (str): Sort direction - 'asc' or 'desc' (default: 'asc')
+        after (str): Keyset cursor; returns the rows after this order_by value
+            instead of seeking to page_number. order_by must be the primary key
+            or a unique, non-nullable column, so no two rows share a cursor value.
 
     Returns:
-        JSON response with paginated data and metadata
+        JSON response with paginated data and metadata. The total count comes
+        from a count(*) OVER () column, so each page is a single query. In
+        keyset mode total_count and total_pages only cover the rows after the
+        cursor, page_number is ignored, has_prev is true because a cursor was
+        supplied, and the pagination metadata carries next_after, the cursor
+        of the following page. Pass the primary key or unique value of the
+        last row seen as the first after.
 
     Example:
         >>> from flask import Flask
@@ -45,7 +67,30 @@ def collection(MarshmallowSchema, searchable_fields=None, sortable_fields=None):
     searchable_fields = searchable_fields or []
     sortable_fields = sortable_fields or []
 
+    if isinstance(searchable_fields, dict):
+        search_modes = dict(searchable_fields)
+    else:
+        search_modes = dict.fromkeys(searchable_fields, "ilike")
+    invalid_modes = set(search_modes.values()) - SEARCH_MODES
+    if invalid_modes:
+        raise ValueError(f"Invalid search modes: {', '.join(sorted(invalid_modes))}")
+
+    # Built once per endpoint; requests only do set lookups
+    searchable = frozenset(search_modes)
+    sortable = frozenset(sortable_fields)
+    search_error = f"Invalid search field. Allowed fields: {', '.join(search_modes)}"
+    sort_error = f"Invalid sort field. Allowed fields: {', '.join(sortable_fields)}"
+
     def decorator(f):
+        # Model attributes per (model_class, field), resolved on first use
+        columns = {}
+
+        def get_column(model_class, field):
+            key = (model_class, field)
+            if key not in columns:
+                columns[key] = getattr(model_class, field, None)
+            return columns[key]
+
         @wraps(f)
         def wrapper(*args, **kwargs):
             # Extract auth from kwargs (injected by jwt_authenticator_with_scopes)
@@ -70,30 +115,17 @@ def collection(MarshmallowSchema, searchable_fields=None, sortable_fields=None):
             # Get sorting parameters
             order_by = request.args.get("order_by", "").strip()
             order_direction = request.args.get("order_direction", "asc").strip().lower()
+            after = request.args.get("after", "").strip()
 
             # Validate search parameters
-            if search_by and search_by not in searchable_fields:
-                return (
-                    jsonify(
-                        {
-                            "error": f"Invalid search field. Allowed fields: {', '.join(searchable_fields)}"
-                        }
-                    ),
-                    400,
-                )
+            if search_by and search_by not in searchable:
+                return jsonify({"error": search_error}), 400
 
             # Validate sorting parameters
-            if order_by and order_by not in sortable_fields:
-                return (
-                    jsonify(
-                        {
-                            "error": f"Invalid sort field. Allowed fields: {', '.join(sortable_fields)}"
-                        }
-                    ),
-                    400,
-                )
+            if order_by and order_by not in sortable:
+                return jsonify({"error": sort_error}), 400
 
-            if order_direction not in ["asc", "desc"]:
+            if order_direction not in ("asc", "desc"):
                 return (
                     jsonify({"error": "order_direction must be 'asc' or 'desc'"}),
                     400,
@@ -109,6 +141,9 @@ def collection(MarshmallowSchema, searchable_fields=None, sortable_fields=None):
             if page_number < 1:
                 return jsonify({"error": "page_number must be greater than 0"}), 400
 
+            if after and not order_by:
+                return jsonify({"error": "after requires order_by"}), 400
+
             session = None  # Initialize for exception handler
             try:
                 # Call the original function with auth parameter
@@ -120,10 +155,21 @@ def collection(MarshmallowSchema, searchable_fields=None, sortable_fields=None):
                 # Apply search filter if provided
                 if search_by and search_value:
                     # Get the column attribute
-                    if hasattr(model_class, search_by):
-                        column = getattr(model_class, search_by)
-                        # Apply case-insensitive LIKE search
-                        query = query.filter(column.ilike(f"%{search_value}%"))
+                    column = get_column(model_class, search_by)
+                    if column is not None:
+                        mode = search_modes[search_by]
+                        if mode == "trgm":
+                            query = query.filter(column.op("%")(search_value))
+                            # Best matches first unless a sort was requested
+                            if not order_by:
+                                query = query.order_by(
+                                    func.similarity(column, search_value).desc()
+                                )
+                        elif mode == "prefix":
+                            query = query.filter(column.ilike(f"{search_value}%"))
+                        else:
+                            # Apply case-insensitive LIKE search
+                            query = query.filter(column.ilike(f"%{search_value}%"))
                     else:
                         return (
                             jsonify(
@@ -133,9 +179,10 @@ def collection(MarshmallowSchema, searchable_fields=None, sortable_fields=None):
                         )
 
                 # Apply sorting if provided
+                column = None
                 if order_by:
-                    if hasattr(model_class, order_by):
-                        column = getattr(model_class, order_by)
+                    column = get_column(model_class, order_by)
+                    if column is not None:
                         # Apply sorting based on direction
                         if order_direction == "desc":
                             query = query.order_by(column.desc())
@@ -152,21 +199,63 @@ def collection(MarshmallowSchema, searchable_fields=None, sortable_fields=None):
                 # Calculate offset
                 offset = (page_number - 1) * results_per_page
 
-                # Get total count after filters but before pagination
-                total_count = query.count()
+                if after:
+                    # Keyset mode seeks through the index instead of skipping rows;
+                    # rows sharing the cursor value would be skipped, so the
+                    # column must be unique
+                    if not _is_unique(column):
+                        return (
+                            jsonify(
+                                {"error": f"Field '{order_by}' is not unique"}
+                            ),
+                            400,
+                        )
+                    if order_direction == "desc":
+                        query = query.filter(column < after)
+                    else:
+                        query = query.filter(column > after)
+                    offset = 0
 
-                # Apply pagination
-                paginated_query = query.limit(results_per_page).offset(offset)
+                # Get session and entity count before the total column is added
+                session = query.session
+                entity_count = len(query.column_descriptions)
+
+                # A window count runs before DISTINCT and GROUP BY collapse the
+                # rows, so those queries keep the separate count query
+                if query._distinct or query._group_by_clauses:
+                    rows = query.limit(results_per_page).offset(offset).all()
+                    total_count = query.count()
+                    if entity_count == 1:
+                        rows = [(row,) for row in rows]
+                else:
+                    # Total count after filters, returned alongside each page row
+                    rows = (
+                        query.add_columns(func.count().over().label(TOTAL_COUNT_LABEL))
+                        .limit(results_per_page)
+                        .offset(offset)
+                        .all()
+                    )
+
+                    if rows:
+                        total_count = getattr(rows[0], TOTAL_COUNT_LABEL)
+                    elif offset:
+                        # Past the last page the window has no row to report on
+                        total_count = query.count()
+                    else:
+                        total_count = 0
 
-                # Execute query and get results
-                results = paginated_query.all()
+                if entity_count == 1:
+                    results = [row[0] for row in rows]
+                else:
+                    results = [tuple(row[:entity_count]) for row in rows]
 
-                # Get the session from the query object
-                session = query.session
+                # Cursor for fetching the following page in keyset mode
+                next_after = None
+                if after and results:
+                    next_after = _cursor_value(getattr(results[-1], order_by, None))
 
                 # Serialize results (do this before closing session)
-                schema = MarshmallowSchema(many=True)
-                serialized_data = schema.dump(results)
+                serialized_data = _get_many_schema(MarshmallowSchema).dump(results)
 
             except Exception as e:
                 # Close session on error
@@ -181,22 +270,62 @@ def collection(MarshmallowSchema, searchable_fields=None, sortable_fields=None):
 
             # Calculate pagination metadata
             total_pages = (total_count + results_per_page - 1) // results_per_page
+            if after:
+                # total_count only covers the rows after the cursor here
+                has_next = total_count > results_per_page
+                has_prev = bool(after)
+            else:
+                has_next = page_number < total_pages
+                has_prev = page_number > 1
+
+            pagination = {
+                "page_number": page_number,
+                "results_per_page": results_per_page,
+                "total_count": total_count,
+                "total_pages": total_pages,
+                "has_next": has_next,
+                "has_prev": has_prev,
+            }
+            if next_after is not None:
+                pagination["next_after"] = next_after
 
             # Build response
-            response = {
-                "data": serialized_data,
-                "pagination": {
-                    "page_number": page_number,
-                    "results_per_page": results_per_page,
-                    "total_count": total_count,
-                    "total_pages": total_pages,
-                    "has_next": page_number < total_pages,
-                    "has_prev": page_number > 1,
-                },
-            }
+            response = {"data": serialized_data, "pagination": pagination}
 
             return jsonify(response), 200
 
         return wrapper
 
     return decorator
+
+
+@lru_cache(maxsize=None)
+def _get_many_schema(schema_class):
+    """Build one many=True schema instance per schema class, shared across requests"""
+    return schema_class(many=True)
+
+
+def _is_unique(column):
+    """Check whether a model attribute can serve as a keyset cursor
+
+    Args:
+        column: InstrumentedAttribute of the model, or None
+
+    Returns:
+        True for primary key and unique, non-nullable columns
+    """
+    expression = getattr(column, "expression", None)
+    if getattr(expression, "primary_key", False):
+        return True
+    return bool(getattr(expression, "unique", False)) and not getattr(
+        expression, "nullable", True
+    )
+
+
+def _cursor_value(value):
+    """Render an order_by value as an after cursor the query string accepts"""
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
@@ -1,4 +1,20 @@
-from typing import List
+from typing import Iterable
+
+# Keys left out of the response unless excluded_keys is given
+DEFAULT_EXCLUDED_KEYS = (
+    "pagination",
+    "meta",
+    "rateLimit",
+    "_links",
+    "requestInfo",
+    "debugInfo",
+    "warnings",
+    "locale",
+    "timezone",
+    "authToken",
+    "success",
+    "dev_message",
+)
 
 
 # TODO: include other fields
@@ -7,20 +23,7 @@ def standard_response(
     ui_message="",
     status_code: int = 200,
     redirect_to_login: bool = False,
-    excluded_keys: List[str] = [
-        "pagination",
-        "meta",
-        "rateLimit",
-        "_links",
-        "requestInfo",
-        "debugInfo",
-        "warnings",
-        "locale",
-        "timezone",
-        "authToken",
-        "success",
-        "dev_message",
-    ],
+    excluded_keys: Iterable[str] = DEFAULT_EXCLUDED_KEYS,
     error: bool = False,
     message: str = "",
     dev_message: str = "",
@@ -32,7 +35,7 @@ def standard_response(
     - data (optional): The data to be included in the response. Defaults to None.
     - ui_message (str, optional): A user interface message. Defaults to an empty string.
     - status_code (int, optional): The HTTP status code for the response. Defaults to 200.
-    - excluded_keys (list, optional): A list of keys to exclude from the response. Defaults to None.
+    - excluded_keys (list, optional): A list of keys to exclude from the response. Defaults to DEFAULT_EXCLUDED_KEYS.
 
     Returns:
     - tuple: A tuple containing the response dictionary and the status code.
@@ -55,8 +58,19 @@ def standard_response(
     False
     """
 
+    # The default exclusions leave only these keys, so skip building the rest
+    if excluded_keys is DEFAULT_EXCLUDED_KEYS:
+        return {
+            "message": message,
+            "error": error,
+            "redirect_to_login": redirect_to_login,
+            "ui_message": ui_message,
+            "status_code": status_code,
+            "data": data,
+        }, status_code
+
     if excluded_keys is None:
-        excluded_keys = []
+        excluded_keys = ()
 
     response_template = {
         "message": message,
@@ -6,7 +6,12 @@ from pamfilico_python_utils.sqlalchemy.auth import (
     NextAuthUserMixin,
     NextAuthVerificationTokenMixin,
 )
-from pamfilico_python_utils.sqlalchemy.mixins import DateTimeMixin
+from pamfilico_python_utils.sqlalchemy.engine import make_engine
+from pamfilico_python_utils.sqlalchemy.mixins import (
+    DateTimeMixin,
+    ServerDateTimeMixin,
+    updated_at_trigger_ddl,
+)
 from pamfilico_python_utils.sqlalchemy.utils import generate_uuid
 
 __all__ = [
@@ -15,5 +20,8 @@ __all__ = [
     "NextAuthSessionMixin",
     "NextAuthUserMixin",
     "NextAuthVerificationTokenMixin",
+    "ServerDateTimeMixin",
     "generate_uuid",
+    "make_engine",
+    "updated_at_trigger_ddl",
 ]
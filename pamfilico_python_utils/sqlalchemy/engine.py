@@ -0,0 +1,26 @@
+from sqlalchemy import create_engine
+
+# Engine defaults; pre-ping drops connections the server closed and recycling
+# replaces them before typical server-side idle timeouts
+ENGINE_DEFAULTS = {
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+}
+
+
+def make_engine(url, **overrides):
+    """
+    Create an SQLAlchemy engine with pooling defaults for long-running apps.
+
+    Args:
+        url: Database URL string or sqlalchemy.engine.URL
+        **overrides: create_engine keyword arguments replacing the defaults,
+            e.g. pool_size or max_overflow
+
+    Returns:
+        Engine: An engine with pool_pre_ping and pool_recycle=1800 unless
+        overridden; everything else keeps SQLAlchemy's defaults.
+    """
+    options = dict(ENGINE_DEFAULTS)
+    options.update(overrides)
+    return create_engine(url, **options)
@@ -1,4 +1,8 @@
-from sqlalchemy import Column, DateTime, func
+from sqlalchemy import DDL, Column, DateTime, FetchedValue, event, func
+from sqlalchemy.ext.declarative import declared_attr
+
+# PL/pgSQL trigger function shared by every ServerDateTimeMixin table
+UPDATED_AT_FUNCTION = "set_updated_at"
 
 
 class DateTimeMixin:
@@ -18,3 +22,68 @@ class DateTimeMixin:
     The `updated_at` field represents the time when the record was last updated.
     It updates to the current time every time the record is updated.
     """
+
+
+def updated_at_trigger_ddl(table_name):
+    """
+    Build the PostgreSQL statements that keep `updated_at` current.
+
+    Run them from a migration, e.g. ``for sql in updated_at_trigger_ddl("users"): op.execute(sql)``.
+    Tables created with metadata.create_all() get them automatically.
+
+    Args:
+        table_name (str): The (optionally schema-qualified) table name.
+
+    Returns:
+        list: The CREATE FUNCTION and CREATE TRIGGER statements.
+    """
+    trigger_name = f"{table_name.rpartition('.')[2]}_{UPDATED_AT_FUNCTION}"
+    return [
+        f"""CREATE OR REPLACE FUNCTION {UPDATED_AT_FUNCTION}() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql""",
+        f"DROP TRIGGER IF EXISTS {trigger_name} ON {table_name}",
+        f"CREATE TRIGGER {trigger_name} BEFORE UPDATE ON {table_name} "
+        f"FOR EACH ROW EXECUTE FUNCTION {UPDATED_AT_FUNCTION}()",
+    ]
+
+
+def _attach_updated_at_trigger(column, table):
+    for sql in updated_at_trigger_ddl(table.fullname):
+        # DDL treats % as a format character
+        ddl = DDL(sql.replace("%", "%%")).execute_if(dialect="postgresql")
+        event.listen(table, "after_create", ddl)
+
+
+class ServerDateTimeMixin:
+    """
+    Variant of DateTimeMixin whose `updated_at` is maintained by the database.
+
+    UPDATE statements no longer carry an `updated_at` parameter; a PostgreSQL
+    BEFORE UPDATE trigger sets it instead. create_all() installs the trigger,
+    databases managed by migrations need updated_at_trigger_ddl(). On other
+    databases `updated_at` only gets its insert default.
+    """
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    """
+    The `created_at` field represents the time when the record was created.
+    It defaults to the current time at the moment of record creation.
+    """
+
+    @declared_attr
+    def updated_at(cls):
+        """
+        The `updated_at` field represents the time when the record was last updated.
+        It starts at the creation time and is set by the trigger on every update.
+        """
+        column = Column(
+            DateTime(timezone=True),
+            server_default=func.now(),
+            server_onupdate=FetchedValue(),
+        )
+        event.listen(column, "after_parent_attach", _attach_updated_at_trigger)
+        return column
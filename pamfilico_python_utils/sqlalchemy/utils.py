@@ -1,11 +1,34 @@
-import uuid
+import os
+import threading
+
+# Random bytes drawn from os.urandom per refill, enough for 1024 UUIDs
+_RANDOM_BUFFER_SIZE = 16 * 1024
+
+_random_buffer = bytearray()
+_random_lock = threading.Lock()
+
+# A forked child must not hand out the UUIDs its parent still has buffered
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_random_buffer.clear)
 
 
 def generate_uuid():
     """
     Generate a unique UUID.
 
+    Produces a random (version 4) UUID like uuid.uuid4(), drawing its bytes
+    from a buffer refilled with os.urandom instead of one syscall per UUID.
+
     Returns:
         str: A string representation of a new UUID.
     """
-    return str(uuid.uuid4())
+    with _random_lock:
+        if len(_random_buffer) < 16:
+            _random_buffer.extend(os.urandom(_RANDOM_BUFFER_SIZE))
+        b = _random_buffer[-16:]
+        del _random_buffer[-16:]
+
+    b[6] = (b[6] & 0x0F) | 0x40  # Version 4
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"